@@ -0,0 +1,164 @@
+"""Monochromatic sound fields and driving functions."""
+import numpy as np
+
+import sfs
+
+omega = 2 * np.pi * 1000
+
+
+class Synthesize:
+    params = [[32, 128, 512], [0.1, 0.02]]
+    param_names = ['loudspeakers', 'spacing']
+
+    def setup(self, N, spacing):
+        self.array = sfs.array.circular(N, 1.5)
+        self.grid = sfs.util.xyz_grid([-2, 2], [-2, 2], 0, spacing=spacing)
+        self.d, self.selection, self.secondary_source = sfs.fd.wfs.point_25d(
+            omega, self.array.x, self.array.n, [-1.5, 2, 0])
+
+    def time_synthesize(self, N, spacing):
+        sfs.fd.synthesize(self.d, self.selection, self.array,
+                          self.secondary_source, grid=self.grid)
+
+    def peakmem_synthesize(self, N, spacing):
+        sfs.fd.synthesize(self.d, self.selection, self.array,
+                          self.secondary_source, grid=self.grid)
+
+
+class SynthesisBasis:
+    params = Synthesize.params
+    param_names = Synthesize.param_names
+
+    def setup(self, N, spacing):
+        Synthesize.setup(self, N, spacing)
+        self.basis = sfs.fd.SynthesisBasis(
+            self.array, self.secondary_source, grid=self.grid)
+
+    def time_synthesize(self, N, spacing):
+        self.basis.synthesize(self.d, self.selection)
+
+
+class DrivingFunctions:
+    params = [[64, 4096], ['wfs.point_25d', 'wfs.plane_3d', 'nfchoa.plane_25d',
+                           'nfchoa.point_25d', 'sdm.line_2d']]
+    param_names = ['loudspeakers', 'function']
+
+    def setup(self, N, function):
+        self.array = sfs.array.circular(N, 1.5)
+        module, name = function.split('.')
+        self.driving_function = getattr(getattr(sfs.fd, module), name)
+        self.source = [-1.5, 2, 0]
+        if name.startswith('plane'):
+            self.source = [0, -1, 0]
+        self.kwargs = {}
+        if module == 'nfchoa':
+            # The default order overflows the Hankel functions for
+            # large arrays, leading to NaN driving functions
+            self.kwargs['max_order'] = min(
+                sfs.util.max_order_circular_harmonics(N), 200)
+        d = np.asarray(self.time_driving_function(N, function)[0])
+        assert np.all(np.isfinite(d))
+
+    def time_driving_function(self, N, function):
+        if function.startswith('nfchoa'):
+            return self.driving_function(omega, self.array.x, 1.5,
+                                         self.source, **self.kwargs)
+        return self.driving_function(omega, self.array.x, self.array.n,
+                                     self.source)
+
+
+class PointModal:
+    params = [100, 300, 1000]
+    param_names = ['frequency']
+
+    def setup(self, frequency):
+        self.grid = sfs.util.xyz_grid([0, 5], [0, 3], 1.5, spacing=0.05)
+
+    def time_point_modal(self, frequency):
+        sfs.fd.source.point_modal(2 * np.pi * frequency, [1, 1, 1],
+                                  self.grid, [5, 3, 2.5])
+
+
+class Broadband:
+    params = [10, 100]
+    param_names = ['frequencies']
+
+    def setup(self, F):
+        self.grid = sfs.util.xyz_grid([-2, 2], [-2, 2], 0, spacing=0.02)
+        self.omega = 2 * np.pi * np.linspace(50, 2000, F)
+
+    def time_point(self, F):
+        for o in self.omega:
+            sfs.fd.source.point(o, [3, 0, 0], self.grid)
+
+    def time_point_broadband(self, F):
+        sfs.fd.source.point_broadband(self.omega, [3, 0, 0], self.grid)
+
+    def time_plane(self, F):
+        for o in self.omega:
+            sfs.fd.source.plane(o, [0, 0, 0], [1, 1, 0], self.grid)
+
+    def time_plane_broadband(self, F):
+        sfs.fd.source.plane_broadband(self.omega, [0, 0, 0], [1, 1, 0],
+                                      self.grid)
+
+
+class SoundFigure3d:
+    params = [16, 32, 64]
+    param_names = ['size']
+
+    def setup(self, size):
+        self.array = sfs.array.cube(N=16, spacing=0.1)
+        self.figure = np.zeros((size, size))
+        self.figure[size // 4:size // 2, size // 4:-size // 4] = 1
+
+    def time_soundfigure_3d(self, size):
+        sfs.fd.wfs.soundfigure_3d(omega, self.array.x, self.array.n,
+                                  self.figure)
+
+
+class LowRankTransfer:
+    params = [[128, 512], [1e-2, 1e-4]]
+    param_names = ['loudspeakers', 'tolerance']
+
+    def setup(self, N, tolerance):
+        Synthesize.setup(self, N, 0.02)
+        # No grid points at the secondary sources
+        self.grid = sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.02)
+        self.transfer = sfs.fd.transfer.LowRankTransfer(
+            self.array, self.secondary_source, self.grid,
+            tolerance=tolerance, seed=0)
+
+    def time_compress(self, N, tolerance):
+        sfs.fd.transfer.LowRankTransfer(
+            self.array, self.secondary_source, self.grid,
+            tolerance=tolerance, seed=0)
+
+    def time_apply(self, N, tolerance):
+        self.transfer.apply(self.d * self.selection)
+
+    def track_rank(self, N, tolerance):
+        return self.transfer.rank
+
+
+class HierarchicalTransfer:
+    params = [[512, 2048], [1e-2, 1e-4]]
+    param_names = ['loudspeakers', 'tolerance']
+
+    def setup(self, N, tolerance):
+        Synthesize.setup(self, N, 0.02)
+        self.grid = sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.02)
+        self.transfer = sfs.fd.transfer.HierarchicalTransfer(
+            self.array, self.secondary_source, self.grid,
+            tolerance=tolerance)
+
+    def time_compress(self, N, tolerance):
+        sfs.fd.transfer.HierarchicalTransfer(
+            self.array, self.secondary_source, self.grid,
+            tolerance=tolerance)
+
+    def time_apply(self, N, tolerance):
+        self.transfer.apply(self.d * self.selection)
+
+    def track_compression(self, N, tolerance):
+        return self.transfer.compression
@@ -0,0 +1,15 @@
+"""Import time of the package, each measured in a new interpreter."""
+
+
+class ImportTime:
+    params = [
+        'import sfs',
+        'import sfs.array',
+        'import sfs.fd.wfs',
+        'import sfs.td.wfs',
+        'import sfs.td.nfchoa',
+    ]
+    param_names = ['statement']
+
+    def timeraw_import(self, statement):
+        return statement
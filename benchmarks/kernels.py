@@ -0,0 +1,42 @@
+"""Row-wise vector kernels used by the driving functions.
+
+The ``*_reference`` benchmarks use ``numpy.core.umath_tests.inner1d``
+(if it is still available) and :func:`numpy.linalg.norm` for comparison.
+
+"""
+import numpy as np
+
+from sfs import _kernels
+
+
+class RowwiseKernels:
+    params = [64, 4096, 2**20]
+    param_names = ['vectors']
+
+    def setup(self, N):
+        rng = np.random.default_rng(42)
+        self.a = rng.standard_normal((N, 3))
+        self.b = rng.standard_normal((N, 3))
+        self.out = np.empty(N)
+
+    def time_inner1d(self, N):
+        _kernels.inner1d(self.a, self.b)
+
+    def time_inner1d_out(self, N):
+        _kernels.inner1d(self.a, self.b, out=self.out)
+
+    def time_inner1d_reference(self, N):
+        try:
+            from numpy.core.umath_tests import inner1d
+        except ImportError:
+            raise NotImplementedError('inner1d is not available')
+        inner1d(self.a, self.b)
+
+    def time_norm1d(self, N):
+        _kernels.norm1d(self.a)
+
+    def time_norm1d_reference(self, N):
+        np.linalg.norm(self.a, axis=1)
+
+    def time_normalize1d(self, N):
+        _kernels.normalize1d(self.a)
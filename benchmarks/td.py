@@ -0,0 +1,58 @@
+"""Broadband sound fields and driving signals."""
+import numpy as np
+from scipy.signal import unit_impulse
+
+import sfs
+
+fs = 44100
+signal = unit_impulse(512), fs
+
+
+class Synthesize:
+    params = [[32, 128, 512], [0.1, 0.02]]
+    param_names = ['loudspeakers', 'spacing']
+
+    def setup(self, N, spacing):
+        self.array = sfs.array.circular(N, 1.5)
+        self.grid = sfs.util.xyz_grid([-2, 2], [-2, 2], 0, spacing=spacing)
+        delays, weights, self.selection, self.secondary_source = \
+            sfs.td.wfs.point_25d(self.array.x, self.array.n, [-1.5, 2, 0])
+        self.d = sfs.td.wfs.driving_signals(delays, weights, signal)
+        self.t = np.linalg.norm([-1.5, 2, 0]) / sfs.default.c
+
+    def time_synthesize_frame(self, N, spacing):
+        sfs.td.synthesize(self.d, self.selection, self.array,
+                          self.secondary_source, grid=self.grid,
+                          observation_time=self.t)
+
+
+class NfchoaDrivingSignals25d:
+    params = [4, 16, 64]
+    param_names = ['max_order']
+
+    def setup(self, max_order):
+        array = sfs.array.circular(2 * max_order + 1, 1.5)
+        self.delay, self.weight, self.sos, self.phaseshift, _, _ = \
+            sfs.td.nfchoa.point_25d(array.x, 1.5, [-3, 2, 0], fs,
+                                    max_order=max_order)
+        self.signal = np.random.default_rng(1).standard_normal(fs), fs
+
+    def time_driving_signals_25d(self, max_order):
+        sfs.td.nfchoa.driving_signals_25d(
+            self.delay, self.weight, self.sos, self.phaseshift, self.signal)
+
+
+class ApplyDelays:
+    params = [[256, 4096], [1000, 20000]]
+    param_names = ['channels', 'samples']
+
+    def setup(self, C, N):
+        rng = np.random.default_rng(1)
+        self.signal = rng.standard_normal(N), fs
+        self.delays = rng.uniform(0, 0.01, C)
+
+    def time_apply_delays(self, C, N):
+        sfs.td.apply_delays(self.signal, self.delays)
+
+    def peakmem_apply_delays(self, C, N):
+        sfs.td.apply_delays(self.signal, self.delays)
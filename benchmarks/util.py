@@ -0,0 +1,10 @@
+"""Utility functions."""
+import sfs
+
+
+class ImageSourcesForBox:
+    params = [2, 5, 10, 20]
+    param_names = ['max_order']
+
+    def time_image_sources_for_box(self, max_order):
+        sfs.util.image_sources_for_box([1, 1, 1], [5, 3, 2.5], max_order)
@@ -38,6 +38,17 @@ class default:
     selection_tolerance = 1e-6
     """Tolerance used for secondary source selection."""
 
+    chunk_size = 2**22
+    """Maximum number of array elements in chunked computations."""
+
+    dtype = 'float64'
+    """Floating point type of computed sound fields.
+
+    Use ``'float32'`` to compute grids, distances and sound fields in
+    single precision (``float32``/``complex64``).
+
+    """
+
     def __setattr__(self, name, value):
         """Only allow setting existing attributes."""
         if name in dir(self) and name != 'reset':
@@ -51,22 +62,44 @@ class default:
         vars(self).clear()
 
 
+import importlib as _importlib
 import sys as _sys
 if not getattr(_sys.modules.get('sphinx'), 'SFS_DOCS_ARE_BEING_BUILT', False):
     # This object shadows the 'default' class, except when the docs are built:
     default = default()
 
-from . import tapering
-from . import array
-from . import util
-try:
-    from . import plot2d
-except ImportError:
-    pass
-try:
-    from . import plot3d
-except ImportError:
-    pass
-
-from . import fd
-from . import td
+
+def _lazy_submodules(namespace, submodules):
+    """Import *submodules* of a package on first attribute access.
+
+    *namespace* is the ``globals()`` dictionary of the package,
+    a module-level ``__getattr__()`` (see :pep:`562`) and ``__dir__()``
+    are added to it.  Before Python 3.7, all *submodules* are imported
+    immediately.
+
+    """
+    package = namespace['__name__']
+
+    def __getattr__(name):
+        if name in submodules:
+            return _importlib.import_module('.' + name, package)
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(package, name))
+
+    def __dir__():
+        return sorted(set(namespace) | set(submodules))
+
+    if _sys.version_info < (3, 7):
+        for name in submodules:
+            try:
+                __getattr__(name)
+            except ImportError:
+                pass  # e.g. Matplotlib is not available
+    else:
+        namespace['__getattr__'] = __getattr__
+        namespace['__dir__'] = __dir__
+
+
+# Matplotlib, scipy.signal etc. are only imported when needed:
+_lazy_submodules(globals(), [
+    'tapering', 'array', 'util', 'plot2d', 'plot3d', 'fd', 'td'])
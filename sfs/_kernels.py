@@ -0,0 +1,112 @@
+"""Row-wise vector operations used by the driving functions.
+
+All functions operate along the last axis and broadcast over all other
+axes, like the (removed) ``numpy.core.umath_tests.inner1d``.
+Two-dimensional arrays of equal shape (e.g. ``(N, 3)`` positions and
+normal vectors) are multiplied block by block and summed with
+:func:`numpy.matmul`, which is faster than :func:`numpy.einsum` for
+short rows.  If all vectors are multiplied with the same vector,
+:func:`numpy.matmul` is used directly, all other cases use
+:func:`numpy.einsum`.
+
+"""
+import numpy as _np
+
+
+def inner1d(a, b, *, out=None):
+    """Inner product of vectors along the last axis.
+
+    Parameters
+    ----------
+    a, b : array_like
+        Vectors along the last axis, all other axes are broadcast.
+    out : numpy.ndarray, optional
+        Array with the broadcast shape (without the last axis) which is
+        used to store the result.
+
+    Returns
+    -------
+    numpy.ndarray
+        Inner products, *out* if given.
+
+    """
+    a = _np.asarray(a)
+    b = _np.asarray(b)
+    if a.ndim == 1:
+        a, b = b, a
+    if b.ndim == 1:
+        # Matrix-vector product, this is much faster than einsum()
+        return _np.matmul(a, b, out=out)
+    if a.ndim == 2 and a.shape == b.shape:
+        dtype = _np.result_type(a, b)
+        if out is None or out.dtype == dtype:
+            return _inner_rows(a, b, dtype, out)
+    return _np.einsum('...i,...i->...', a, b, out=out)
+
+
+def norm1d(a, *, out=None):
+    """Euclidean norm of vectors along the last axis.
+
+    Parameters
+    ----------
+    a : array_like
+        Vectors along the last axis.
+    out : numpy.ndarray, optional
+        Floating point array with the shape of *a* (without the last
+        axis) which is used to store the result.
+
+    Returns
+    -------
+    numpy.ndarray
+        Lengths of the vectors, *out* if given.
+
+    """
+    a = _np.asarray(a)
+    if out is None and a.dtype.kind != 'f':
+        a = a.astype(float)
+    return _np.sqrt(inner1d(a, a, out=out), out=out)
+
+
+def normalize1d(a, *, out=None):
+    """Normalize vectors along the last axis to unit length.
+
+    Parameters
+    ----------
+    a : array_like
+        Vectors along the last axis.
+    out : numpy.ndarray, optional
+        Floating point array with the shape of *a* which is used to
+        store the result.  This may be *a* itself.
+
+    Returns
+    -------
+    numpy.ndarray
+        Normalized vectors, *out* if given.
+
+    """
+    a = _np.asarray(a)
+    length = norm1d(a)
+    return _np.divide(a, _np.expand_dims(length, -1), out=out)
+
+
+def _inner_rows(a, b, dtype, out, blocksize=4096):
+    """Row-wise inner product of two 2D arrays with the same shape.
+
+    The element-wise products are stored in a temporary array of at
+    most *blocksize* rows (to stay in the CPU cache), their sums are
+    computed with a matrix-vector product.
+
+    """
+    rows, columns = a.shape
+    ones = _np.ones(columns, dtype=dtype)
+    if rows <= blocksize:
+        return _np.matmul(_np.multiply(a, b), ones, out=out)
+    if out is None:
+        out = _np.empty(rows, dtype=dtype)
+    products = _np.empty((min(rows, blocksize), columns), dtype=dtype)
+    for start in range(0, rows, blocksize):
+        stop = min(start + blocksize, rows)
+        block = products[:stop - start]
+        _np.multiply(a[start:stop], b[start:stop], out=block)
+        _np.matmul(block, ones, out=out[start:stop])
+    return out
@@ -664,7 +664,7 @@ def weights_midpoint(positions, *, closed):
         before, after = -1, 0  # cyclic
     else:
         before, after = 1, -2  # mirrored
-    positions = _np.row_stack((positions[before], positions, positions[after]))
+    positions = _np.vstack((positions[before], positions, positions[after]))
     distances = _np.linalg.norm(_np.diff(positions, axis=0), axis=1)
     return (distances[:-1] + distances[1:]) / 2
 
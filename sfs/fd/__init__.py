@@ -10,11 +10,15 @@
     sdm
     esa
 
+    transfer
+
 """
 import numpy as _np
 
 from . import source
+from .. import _lazy_submodules
 from .. import array as _array
+from .. import default as _default
 from .. import util as _util
 
 
@@ -35,7 +39,8 @@ def displacement(v, omega):
     return _util.as_xyz_components(v) / (1j * omega)
 
 
-def synthesize(d, weights, ssd, secondary_source_function, **kwargs):
+def synthesize(d, weights, ssd, secondary_source_function, *,
+               chunksize=None, out=None, **kwargs):
     """Compute sound field for a generic driving function.
 
     Parameters
@@ -56,41 +61,258 @@ def synthesize(d, weights, ssd, secondary_source_function, **kwargs):
                 position, normal_vector, weight, driving_function_weight,
                 **kwargs) -> numpy.ndarray
 
+        If the function has an attribute ``vectorized`` which is
+        ``True``, it is called with the positions and normal vectors of
+        several secondary sources at once (each with shape ``(C, 3)``)
+        and it must return their sound fields stacked along the first
+        axis.  See `secondary_source_point()` and
+        `secondary_source_line()`.
+    chunksize : int, optional
+        Maximum number of secondary sources passed to a vectorized
+        *secondary_source_function* at once.  By default, it is chosen
+        such that the stacked sound fields have no more than
+        ``sfs.default.chunk_size`` elements.
+    out : array_like, optional
+        Complex array with the broadcast shape of *grid* which is used
+        to store the result, e.g. a `numpy.memmap` or an HDF5 dataset.
+        The sound field is computed and stored in tiles (with at most
+        ``sfs.default.chunk_size`` grid points), see
+        `sfs.util.evaluate_in_chunks()`.
     **kwargs
         All keyword arguments are forwarded to *secondary_source_function*.
-        This is typically used to pass the *grid* argument.
+        This is typically used to pass the *grid* argument and,
+        optionally, the *dtype* argument (see `sfs.default.dtype`).
+
+    Returns
+    -------
+    array_like
+        Sound field at the positions given by *grid* (*out*, if given).
 
     """
+    if out is not None:
+        grid = kwargs.pop('grid')
+        return _util.evaluate_in_chunks(
+            lambda grid: synthesize(d, weights, ssd, secondary_source_function,
+                                    chunksize=chunksize, grid=grid, **kwargs),
+            grid, _default.chunk_size, out=out)
     ssd = _array.as_secondary_source_distribution(ssd)
     if not (len(ssd.x) == len(ssd.n) == len(ssd.a) == len(d) ==
             len(weights)):
         raise ValueError("length mismatch")
+    if not getattr(secondary_source_function, 'vectorized', False):
+        p = 0
+        for x, n, a, d, weight in zip(ssd.x, ssd.n, ssd.a, d, weights):
+            if weight != 0:
+                p += a * weight * d * secondary_source_function(x, n, **kwargs)
+        return p
+    weights = _np.asarray(weights)
+    active = _np.flatnonzero(weights != 0)
+    coefficients = ssd.a * weights * _np.asarray(d)
     p = 0
-    for x, n, a, d, weight in zip(ssd.x, ssd.n, ssd.a, d, weights):
-        if weight != 0:
-            p += a * weight * d * secondary_source_function(x, n, **kwargs)
+    step = chunksize or 1
+    start = 0
+    while start < len(active):
+        idx = active[start:start + step]
+        fields = secondary_source_function(ssd.x[idx], ssd.n[idx], **kwargs)
+        # Keep the precision of the sound fields, e.g. complex64
+        coeffs = coefficients[idx].astype(
+            _np.promote_types(fields.dtype, _np.complex64))
+        p = p + _np.tensordot(coeffs, fields, axes=1)
+        start += len(idx)
+        if chunksize is None:
+            step = max(1, _default.chunk_size * len(idx) // fields.size)
     return p
 
 
+class SynthesisBasis:
+    """Sound fields of all secondary sources, for repeated synthesis.
+
+    `sfs.fd.synthesize()` is linear in ``d * weights``.  Once the sound
+    fields of all secondary sources (for a given array, grid and
+    frequency) are stored, the sound field for any driving function
+    and tapering is obtained with a single matrix-vector product.
+
+    Parameters
+    ----------
+    ssd : sequence of between 1 and 3 array_like objects
+        Positions, normal vectors and weights of secondary sources.
+        A `SecondarySourceDistribution` can also be used.
+    secondary_source_function : callable
+        A function that generates the sound field of a secondary source,
+        see `sfs.fd.synthesize()`.
+    dtype : data-type, optional
+        Floating point type of the stored sound fields, e.g.
+        ``'float32'`` to store them as ``complex64``, which halves the
+        memory.  Default: ``sfs.default.dtype``.
+    chunksize : int, optional
+        Maximum number of secondary sources passed to a vectorized
+        *secondary_source_function* at once, see `sfs.fd.synthesize()`.
+    **kwargs
+        All keyword arguments are forwarded to *secondary_source_function*.
+        This is typically used to pass the *grid* argument.
+
+    Attributes
+    ----------
+    fields : (N, M) numpy.ndarray
+        Sound fields of the N secondary sources (multiplied by their
+        weights ``ssd.a``) at M positions, flattened.
+    shape : tuple of int
+        Shape of the synthesized sound fields.
+
+    Examples
+    --------
+    ::
+
+        d, selection, secondary_source = sfs.fd.wfs.point_25d(
+            omega, array.x, array.n, xs)
+        basis = sfs.fd.SynthesisBasis(array, secondary_source, grid=grid)
+        for alpha in 0, 0.25, 0.5:
+            twin = sfs.tapering.tukey(selection, alpha=alpha)
+            p = basis.synthesize(d, twin)
+
+    """
+
+    def __init__(self, ssd, secondary_source_function, *, dtype=None,
+                 chunksize=None, **kwargs):
+        ssd = _array.as_secondary_source_distribution(ssd)
+        dtype = _util.complex_dtype(dtype)
+        N = len(ssd.x)
+        step = chunksize or 1
+        start = 0
+        while start < N:
+            chunk = _secondary_source_fields(
+                ssd, slice(start, start + step), secondary_source_function,
+                **kwargs)
+            if start == 0:
+                self.shape = chunk.shape[1:]
+                self.fields = _np.empty((N, chunk[0].size), dtype=dtype)
+            stop = start + len(chunk)
+            self.fields[start:stop] = chunk.reshape(len(chunk), -1)
+            start = stop
+            if chunksize is None:
+                step = max(1, _default.chunk_size * len(chunk) // chunk.size)
+        self.fields *= ssd.a[:, _np.newaxis]
+        # e.g. grid points at secondary source positions, see synthesize()
+        self._nonfinite = _np.nonzero(~_np.isfinite(self.fields))
+
+    def synthesize(self, d, weights):
+        """Compute sound field for a given driving function.
+
+        Parameters
+        ----------
+        d : (N,) or (..., N) array_like
+            Driving function.  If it has more than one dimension,
+            one sound field is computed for each driving function
+            along the last axis.
+        weights : (N,) array_like
+            Additional weights, see `sfs.fd.synthesize()`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sound field with shape `shape` (preceded by the leading
+            dimensions of *d*).
+
+        """
+        weights = _util.asarray_1d(weights)
+        coefficients = (_np.asarray(d) * weights).astype(self.fields.dtype)
+        p = coefficients @ self.fields
+        # Like sfs.fd.synthesize(), ignore secondary sources with zero
+        # weight, even if their sound field is not finite (0 * inf):
+        rows, columns = self._nonfinite
+        columns = _np.unique(columns[weights[rows] == 0])
+        if columns.size:
+            active = _np.flatnonzero(weights != 0)
+            p[..., columns] = (coefficients[..., active] @
+                               self.fields[_np.ix_(active, columns)])
+        return p.reshape(p.shape[:-1] + self.shape)
+
+
+def _secondary_source_fields(ssd, index, secondary_source_function,
+                             **kwargs):
+    """Sound fields of the secondary sources ``ssd[index]``, stacked.
+
+    The weights ``ssd.a`` are not applied.
+
+    """
+    if getattr(secondary_source_function, 'vectorized', False):
+        return secondary_source_function(ssd.x[index], ssd.n[index],
+                                         **kwargs)
+    return _np.stack([secondary_source_function(x, n, **kwargs)
+                      for x, n in zip(ssd.x[index], ssd.n[index])])
+
+
+def _as_frequency_column(omega):
+    """Prepare angular frequencies for broadcasting in driving functions.
+
+    A scalar is returned unchanged, a sequence of F frequencies is
+    turned into a column vector with shape ``(F, 1)``, which leads to
+    driving functions with shape ``(F, N)``.
+
+    """
+    if _np.ndim(omega) == 0:
+        return omega
+    return _util.asarray_1d(omega).reshape(-1, 1)
+
+
 def secondary_source_point(omega, c):
-    """Create a point source for use in `sfs.fd.synthesize()`."""
+    """Create a point source for use in `sfs.fd.synthesize()`.
 
-    def secondary_source(position, _, grid):
-        return source.point(omega, position, grid, c=c)
+    The returned function is vectorized, i.e. it also accepts a
+    ``(C, 3)`` array of positions and returns the sound fields of all
+    C point sources stacked along the first axis.
+    The optional *dtype* argument is forwarded to
+    `sfs.fd.source.point()`.
+
+    Returns
+    -------
+    callable or list of callable
+        A secondary source function for `sfs.fd.synthesize()`.
+        If *omega* is a sequence of frequencies, a list with one
+        function per frequency is returned.
+
+    """
+    if _np.ndim(omega) != 0:
+        return [secondary_source_point(o, c) for o in _util.asarray_1d(omega)]
 
+    def secondary_source(position, _, grid, dtype=None):
+        if _np.ndim(position) == 2:
+            return source._point_stack(omega, position, grid, c=c,
+                                       dtype=dtype)
+        return source.point(omega, position, grid, c=c, dtype=dtype)
+
+    secondary_source.vectorized = True
     return secondary_source
 
 
 def secondary_source_line(omega, c):
-    """Create a line source for use in `sfs.fd.synthesize()`."""
+    """Create a line source for use in `sfs.fd.synthesize()`.
+
+    The returned function is vectorized, i.e. it also accepts a
+    ``(C, 3)`` array of positions and returns the sound fields of all
+    C line sources stacked along the first axis.
+    The optional *dtype* argument is forwarded to
+    `sfs.fd.source.line()`.
+
+    Returns
+    -------
+    callable or list of callable
+        A secondary source function for `sfs.fd.synthesize()`.
+        If *omega* is a sequence of frequencies, a list with one
+        function per frequency is returned.
+
+    """
+    if _np.ndim(omega) != 0:
+        return [secondary_source_line(o, c) for o in _util.asarray_1d(omega)]
 
-    def secondary_source(position, _, grid):
-        return source.line(omega, position, grid, c=c)
+    def secondary_source(position, _, grid, dtype=None):
+        if _np.ndim(position) == 2:
+            return source._line_stack(omega, position, grid, c=c,
+                                      dtype=dtype)
+        return source.line(omega, position, grid, c=c, dtype=dtype)
 
+    secondary_source.vectorized = True
     return secondary_source
 
 
-from . import esa
-from . import nfchoa
-from . import sdm
-from . import wfs
+_lazy_submodules(globals(), ['esa', 'nfchoa', 'sdm', 'transfer', 'wfs'])
@@ -10,10 +10,11 @@ to ESA in their specific geometries (spherical/circular, planar/linear).
 
 """
 import numpy as _np
-from scipy.special import jn as _jn, hankel2 as _hankel2
 
+from . import _as_frequency_column
 from . import secondary_source_line as _secondary_source_line
 from . import secondary_source_point as _secondary_source_point
+from .. import _kernels
 from .. import util as _util
 
 
@@ -27,7 +28,7 @@ def plane_2d_edge(omega, x0, n=[0, 1, 0], *, alpha=_np.pi*3/2, Nc=None,
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency.
     x0 : int(N, 3) array_like
         Sequence of secondary source positions.
@@ -37,20 +38,22 @@ def plane_2d_edge(omega, x0, n=[0, 1, 0], *, alpha=_np.pi*3/2, Nc=None,
         Outer angle of edge.
     Nc : int, optional
         Number of elements for series expansion of driving function. Estimated
-        if not given.
+        (for the highest frequency) if not given.
     c : float, optional
         Speed of sound
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -62,27 +65,28 @@ def plane_2d_edge(omega, x0, n=[0, 1, 0], *, alpha=_np.pi*3/2, Nc=None,
     """
     x0 = _np.asarray(x0)
     n = _util.normalize_vector(n)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     phi_s = _np.arctan2(n[1], n[0]) + _np.pi
-    L = x0.shape[0]
 
-    r = _np.linalg.norm(x0, axis=1)
+    r = _kernels.norm1d(x0)
     phi = _np.arctan2(x0[:, 1], x0[:, 0])
     phi = _np.where(phi < 0, phi + 2 * _np.pi, phi)
 
     if Nc is None:
-        Nc = _np.ceil(2 * k * _np.max(r) * alpha / _np.pi)
+        Nc = int(_np.ceil(2 * _np.max(k) * _np.max(r) * alpha / _np.pi))
 
     epsilon = _np.ones(Nc)  # weights for series expansion
     epsilon[0] = 2
 
-    d = _np.zeros(L, dtype=complex)
-    for m in _np.arange(Nc):
-        nu = m * _np.pi / alpha
-        d = d + 1/epsilon[m] * _np.exp(1j*nu*_np.pi/2) * _np.sin(nu*phi_s) \
-            * _np.cos(nu*phi) * nu/r * _jn(nu, k*r)
+    # All orders at once, along the last axis
+    nu = _np.arange(Nc) * _np.pi / alpha
+    kr = _np.asarray(k)[..., _np.newaxis] * r[:, _np.newaxis]
+    jn = _util.special_function_table('jn', nu, kr)
+    d = _np.sum(1/epsilon * _np.exp(1j*nu*_np.pi/2) * _np.sin(nu*phi_s)
+                * _np.cos(nu*phi[:, _np.newaxis]) * nu/r[:, _np.newaxis] * jn,
+                axis=-1)
 
-    d[phi > 0] = -d[phi > 0]
+    d[..., phi > 0] = -d[..., phi > 0]
 
     selection = _util.source_selection_all(len(x0))
     return 4*_np.pi/alpha * d, selection, _secondary_source_line(omega, c)
@@ -98,7 +102,7 @@ def plane_2d_edge_dipole_ssd(omega, x0, n=[0, 1, 0], *, alpha=_np.pi*3/2,
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency.
     x0 : int(N, 3) array_like
         Sequence of secondary source positions.
@@ -108,20 +112,22 @@ def plane_2d_edge_dipole_ssd(omega, x0, n=[0, 1, 0], *, alpha=_np.pi*3/2,
         Outer angle of edge.
     Nc : int, optional
         Number of elements for series expansion of driving function. Estimated
-        if not given.
+        (for the highest frequency) if not given.
     c : float, optional
         Speed of sound
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -133,25 +139,25 @@ def plane_2d_edge_dipole_ssd(omega, x0, n=[0, 1, 0], *, alpha=_np.pi*3/2,
     """
     x0 = _np.asarray(x0)
     n = _util.normalize_vector(n)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     phi_s = _np.arctan2(n[1], n[0]) + _np.pi
-    L = x0.shape[0]
 
-    r = _np.linalg.norm(x0, axis=1)
+    r = _kernels.norm1d(x0)
     phi = _np.arctan2(x0[:, 1], x0[:, 0])
     phi = _np.where(phi < 0, phi + 2 * _np.pi, phi)
 
     if Nc is None:
-        Nc = _np.ceil(2 * k * _np.max(r) * alpha / _np.pi)
+        Nc = int(_np.ceil(2 * _np.max(k) * _np.max(r) * alpha / _np.pi))
 
     epsilon = _np.ones(Nc)  # weights for series expansion
     epsilon[0] = 2
 
-    d = _np.zeros(L, dtype=complex)
-    for m in _np.arange(Nc):
-        nu = m * _np.pi / alpha
-        d = d + 1/epsilon[m] * _np.exp(1j*nu*_np.pi/2) * _np.cos(nu*phi_s) \
-            * _np.cos(nu*phi) * _jn(nu, k*r)
+    # All orders at once, along the last axis
+    nu = _np.arange(Nc) * _np.pi / alpha
+    kr = _np.asarray(k)[..., _np.newaxis] * r[:, _np.newaxis]
+    jn = _util.special_function_table('jn', nu, kr)
+    d = _np.sum(1/epsilon * _np.exp(1j*nu*_np.pi/2) * _np.cos(nu*phi_s)
+                * _np.cos(nu*phi[:, _np.newaxis]) * jn, axis=-1)
 
     return 4*_np.pi/alpha * d
 
@@ -165,7 +171,7 @@ def line_2d_edge(omega, x0, xs, *, alpha=_np.pi*3/2, Nc=None, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency.
     x0 : int(N, 3) array_like
         Sequence of secondary source positions.
@@ -175,20 +181,22 @@ def line_2d_edge(omega, x0, xs, *, alpha=_np.pi*3/2, Nc=None, c=None):
         Outer angle of edge.
     Nc : int, optional
         Number of elements for series expansion of driving function. Estimated
-        if not given.
+        (for the highest frequency) if not given.
     c : float, optional
         Speed of sound
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -199,32 +207,29 @@ def line_2d_edge(omega, x0, xs, *, alpha=_np.pi*3/2, Nc=None, c=None):
 
     """
     x0 = _np.asarray(x0)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     phi_s = _np.arctan2(xs[1], xs[0])
     if phi_s < 0:
         phi_s = phi_s + 2 * _np.pi
     r_s = _np.linalg.norm(xs)
-    L = x0.shape[0]
 
-    r = _np.linalg.norm(x0, axis=1)
+    r = _kernels.norm1d(x0)
     phi = _np.arctan2(x0[:, 1], x0[:, 0])
     phi = _np.where(phi < 0, phi + 2 * _np.pi, phi)
 
     if Nc is None:
-        Nc = _np.ceil(2 * k * _np.max(r) * alpha / _np.pi)
+        Nc = int(_np.ceil(2 * _np.max(k) * _np.max(r) * alpha / _np.pi))
 
     epsilon = _np.ones(Nc)  # weights for series expansion
     epsilon[0] = 2
 
-    d = _np.zeros(L, dtype=complex)
-    idx = (r <= r_s)
-    for m in _np.arange(Nc):
-        nu = m * _np.pi / alpha
-        f = 1/epsilon[m] * _np.sin(nu*phi_s) * _np.cos(nu*phi) * nu/r
-        d[idx] = d[idx] + f[idx] * _jn(nu, k*r[idx]) * _hankel2(nu, k*r_s)
-        d[~idx] = d[~idx] + f[~idx] * _jn(nu, k*r_s) * _hankel2(nu, k*r[~idx])
+    # All orders at once, along the last axis
+    nu = _np.arange(Nc) * _np.pi / alpha
+    f = (1/epsilon * _np.sin(nu*phi_s) * _np.cos(nu*phi[:, _np.newaxis])
+         * nu/r[:, _np.newaxis])
+    d = _np.sum(f * _bessel_hankel_product(nu, k, r, r_s), axis=-1)
 
-    d[phi > 0] = -d[phi > 0]
+    d[..., phi > 0] = -d[..., phi > 0]
 
     selection = _util.source_selection_all(len(x0))
     return -1j*_np.pi/alpha * d, selection, _secondary_source_line(omega, c)
@@ -240,7 +245,7 @@ def line_2d_edge_dipole_ssd(omega, x0, xs, *, alpha=_np.pi*3/2, Nc=None,
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -250,20 +255,22 @@ def line_2d_edge_dipole_ssd(omega, x0, xs, *, alpha=_np.pi*3/2, Nc=None,
         Outer angle of edge.
     Nc : int, optional
         Number of elements for series expansion of driving function. Estimated
-        if not given.
+        (for the highest frequency) if not given.
     c : float, optional
         Speed of sound
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -274,30 +281,26 @@ def line_2d_edge_dipole_ssd(omega, x0, xs, *, alpha=_np.pi*3/2, Nc=None,
 
     """
     x0 = _np.asarray(x0)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     phi_s = _np.arctan2(xs[1], xs[0])
     if phi_s < 0:
         phi_s = phi_s + 2 * _np.pi
     r_s = _np.linalg.norm(xs)
-    L = x0.shape[0]
 
-    r = _np.linalg.norm(x0, axis=1)
+    r = _kernels.norm1d(x0)
     phi = _np.arctan2(x0[:, 1], x0[:, 0])
     phi = _np.where(phi < 0, phi + 2 * _np.pi, phi)
 
     if Nc is None:
-        Nc = _np.ceil(2 * k * _np.max(r) * alpha / _np.pi)
+        Nc = int(_np.ceil(2 * _np.max(k) * _np.max(r) * alpha / _np.pi))
 
     epsilon = _np.ones(Nc)  # weights for series expansion
     epsilon[0] = 2
 
-    d = _np.zeros(L, dtype=complex)
-    idx = (r <= r_s)
-    for m in _np.arange(Nc):
-        nu = m * _np.pi / alpha
-        f = 1/epsilon[m] * _np.cos(nu*phi_s) * _np.cos(nu*phi)
-        d[idx] = d[idx] + f[idx] * _jn(nu, k*r[idx]) * _hankel2(nu, k*r_s)
-        d[~idx] = d[~idx] + f[~idx] * _jn(nu, k*r_s) * _hankel2(nu, k*r[~idx])
+    # All orders at once, along the last axis
+    nu = _np.arange(Nc) * _np.pi / alpha
+    f = 1/epsilon * _np.cos(nu*phi_s) * _np.cos(nu*phi[:, _np.newaxis])
+    d = _np.sum(f * _bessel_hankel_product(nu, k, r, r_s), axis=-1)
 
     return -1j*_np.pi/alpha * d
 
@@ -312,7 +315,7 @@ def point_25d_edge(omega, x0, xs, *, xref=[2, -2, 0], alpha=_np.pi*3/2,
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency.
     x0 : int(N, 3) array_like
         Sequence of secondary source positions.
@@ -324,20 +327,22 @@ def point_25d_edge(omega, x0, xs, *, xref=[2, -2, 0], alpha=_np.pi*3/2,
         Outer angle of edge.
     Nc : int, optional
         Number of elements for series expansion of driving function. Estimated
-        if not given.
+        (for the highest frequency) if not given.
     c : float, optional
         Speed of sound
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -354,7 +359,16 @@ def point_25d_edge(omega, x0, xs, *, xref=[2, -2, 0], alpha=_np.pi*3/2,
     if _np.isscalar(xref):
         a = _np.linalg.norm(xref) / _np.linalg.norm(xref - xs)
     else:
-        a = _np.linalg.norm(xref - x0, axis=1) / _np.linalg.norm(xref - xs)
+        a = _kernels.norm1d(xref - x0) / _np.linalg.norm(xref - xs)
 
     d, selection, _ = line_2d_edge(omega, x0, xs, alpha=alpha, Nc=Nc, c=c)
     return 1j*_np.sqrt(a) * d, selection, _secondary_source_point(omega, c)
+
+
+def _bessel_hankel_product(nu, k, r, r_s):
+    """J_nu(k r_<) H_nu(k r_>) for all orders nu, along the last axis."""
+    r = r[:, _np.newaxis]
+    k = _np.asarray(k)[..., _np.newaxis]
+    return (_util.special_function_table('jn', nu, k * _np.minimum(r, r_s)) *
+            _util.special_function_table('hankel2', nu,
+                                         k * _np.maximum(r, r_s)))
@@ -29,8 +29,8 @@
 
 """
 import numpy as _np
-from scipy.special import hankel2 as _hankel2
 
+from . import _as_frequency_column
 from . import secondary_source_point as _secondary_source_point
 from .. import util as _util
 
@@ -40,7 +40,7 @@ def plane_2d(omega, x0, r0, n=[0, 1, 0], *, max_order=None, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of plane wave.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -55,14 +55,16 @@ def plane_2d(omega, x0, r0, n=[0, 1, 0], *, max_order=None, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing only ``True`` indicating that
         all secondary source are "active" for NFC-HOA.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -90,13 +92,16 @@ def plane_2d(omega, x0, r0, n=[0, 1, 0], *, max_order=None, c=None):
         max_order = _util.max_order_circular_harmonics(len(x0))
 
     x0 = _util.asarray_of_rows(x0)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     n = _util.normalize_vector(n)
     phi, _, r = _util.cart2sph(*n)
     phi0 = _util.cart2sph(*x0.T)[0]
-    d = 0
-    for m in range(-max_order, max_order + 1):
-        d += 1j**-m / _hankel2(m, k * r0) * _np.exp(1j * m * (phi0 - phi))
+    m = _np.arange(-max_order, max_order + 1)
+    hn2 = _util.special_function_table('hankel2', range(max_order + 1),
+                                       k * r0)
+    # Negative orders: H_{-m} = (-1)^m H_m
+    hn2 = _np.where(m % 2 & (m < 0), -1, 1) * hn2[..., abs(m)]
+    d = _circular_harmonics_sum(1j**-m / hn2, phi0, phi)
     selection = _util.source_selection_all(len(x0))
     return -2j / (_np.pi*r0) * d, selection, _secondary_source_point(omega, c)
 
@@ -106,7 +111,7 @@ def point_25d(omega, x0, r0, xs, *, max_order=None, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of point source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -121,14 +126,16 @@ def point_25d(omega, x0, r0, xs, *, max_order=None, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing only ``True`` indicating that
         all secondary source are "active" for NFC-HOA.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -156,15 +163,16 @@ def point_25d(omega, x0, r0, xs, *, max_order=None, c=None):
         max_order = _util.max_order_circular_harmonics(len(x0))
 
     x0 = _util.asarray_of_rows(x0)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     xs = _util.asarray_1d(xs)
     phi, _, r = _util.cart2sph(*xs)
     phi0 = _util.cart2sph(*x0.T)[0]
-    hr = _util.spherical_hn2(range(0, max_order + 1), k * r)
-    hr0 = _util.spherical_hn2(range(0, max_order + 1), k * r0)
-    d = 0
-    for m in range(-max_order, max_order + 1):
-        d += hr[abs(m)] / hr0[abs(m)] * _np.exp(1j * m * (phi0 - phi))
+    hr = _util.special_function_table('spherical_hn2', range(max_order + 1),
+                                      k * r)
+    hr0 = _util.special_function_table('spherical_hn2', range(max_order + 1),
+                                       k * r0)
+    m = _np.arange(-max_order, max_order + 1)
+    d = _circular_harmonics_sum(hr[..., abs(m)] / hr0[..., abs(m)], phi0, phi)
     selection = _util.source_selection_all(len(x0))
     return d / (2 * _np.pi * r0), selection, _secondary_source_point(omega, c)
 
@@ -174,7 +182,7 @@ def plane_25d(omega, x0, r0, n=[0, 1, 0], *, max_order=None, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of point source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -189,14 +197,16 @@ def plane_25d(omega, x0, r0, n=[0, 1, 0], *, max_order=None, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing only ``True`` indicating that
         all secondary source are "active" for NFC-HOA.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -224,13 +234,43 @@ def plane_25d(omega, x0, r0, n=[0, 1, 0], *, max_order=None, c=None):
         max_order = _util.max_order_circular_harmonics(len(x0))
 
     x0 = _util.asarray_of_rows(x0)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     n = _util.normalize_vector(n)
     phi, _, r = _util.cart2sph(*n)
     phi0 = _util.cart2sph(*x0.T)[0]
-    d = 0
-    hn2 = _util.spherical_hn2(range(0, max_order + 1), k * r0)
-    for m in range(-max_order, max_order + 1):
-        d += (-1j)**abs(m) / (k * hn2[abs(m)]) * _np.exp(1j * m * (phi0 - phi))
+    hn2 = _util.special_function_table('spherical_hn2', range(max_order + 1),
+                                       k * r0)
+    m = _np.arange(-max_order, max_order + 1)
+    d = _circular_harmonics_sum((-1j)**abs(m) / (k * hn2[..., abs(m)]),
+                                phi0, phi)
     selection = _util.source_selection_all(len(x0))
     return 2*1j / r0 * d, selection, _secondary_source_point(omega, c)
+
+
+def _circular_harmonics_sum(coefficients, phi0, phi):
+    """Sum of circular harmonics at the secondary source angles.
+
+    Computes ``sum(c_m * exp(1j * m * (phi0 - phi)))`` over the orders
+    ``m = -M, ..., M`` (last axis of *coefficients*) for each angle
+    *phi0* (shape ``(N,)``).  For equiangular secondary sources (e.g.
+    `sfs.array.circular()`), this is an inverse DFT over the orders
+    (which are wrapped modulo N), otherwise a matrix product is used.
+
+    """
+    coefficients = _np.asarray(coefficients)
+    *shape, orders = coefficients.shape
+    max_order = (orders - 1) // 2
+    m = _np.arange(-max_order, max_order + 1)
+    N = len(phi0)
+    steps = _np.diff(_np.unwrap(phi0))
+    step = 2 * _np.pi / N
+    if N > 1 and (_np.allclose(steps, step) or _np.allclose(steps, -step)):
+        padded = _np.zeros(shape + [-(-orders // N) * N], dtype=complex)
+        padded[..., :orders] = coefficients * _np.exp(1j * m * (phi0[0] - phi))
+        # Index of the folded coefficients is "m modulo N":
+        folded = _np.roll(padded.reshape(shape + [-1, N]).sum(axis=-2),
+                          -max_order, axis=-1)
+        if steps[0] > 0:
+            return N * _np.fft.ifft(folded, axis=-1)
+        return _np.fft.fft(folded, axis=-1)
+    return coefficients @ _np.exp(1j * _np.outer(m, phi0 - phi))
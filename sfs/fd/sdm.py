@@ -30,8 +30,10 @@
 import numpy as _np
 from scipy.special import hankel2 as _hankel2
 
+from . import _as_frequency_column
 from . import secondary_source_line as _secondary_source_line
 from . import secondary_source_point as _secondary_source_point
+from .. import _kernels
 from .. import util as _util
 
 
@@ -40,7 +42,7 @@ def line_2d(omega, x0, n0, xs, *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of line source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -53,14 +55,16 @@ def line_2d(omega, x0, n0, xs, *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -80,9 +84,9 @@ def line_2d(omega, x0, n0, xs, *, c=None):
     x0 = _util.asarray_of_rows(x0)
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
+    r = _kernels.norm1d(ds)
     d = - 1j/2 * k * xs[1] / r * _hankel2(1, k * r)
     selection = _util.source_selection_all(len(x0))
     return d, selection, _secondary_source_line(omega, c)
@@ -93,7 +97,7 @@ def plane_2d(omega, x0, n0, n=[0, 1, 0], *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of plane wave.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -106,14 +110,16 @@ def plane_2d(omega, x0, n0, n=[0, 1, 0], *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -137,7 +143,7 @@ def plane_2d(omega, x0, n0, n=[0, 1, 0], *, c=None):
     x0 = _util.asarray_of_rows(x0)
     n0 = _util.asarray_of_rows(n0)
     n = _util.normalize_vector(n)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     d = k * n[1] * _np.exp(-1j * k * n[0] * x0[:, 0])
     selection = _util.source_selection_all(len(x0))
     return d, selection, _secondary_source_line(omega, c)
@@ -148,7 +154,7 @@ def plane_25d(omega, x0, n0, n=[0, 1, 0], *, xref=[0, 0, 0], c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of plane wave.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -163,14 +169,16 @@ def plane_25d(omega, x0, n0, n=[0, 1, 0], *, xref=[0, 0, 0], c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -191,7 +199,7 @@ def plane_25d(omega, x0, n0, n=[0, 1, 0], *, xref=[0, 0, 0], c=None):
     n0 = _util.asarray_of_rows(n0)
     n = _util.normalize_vector(n)
     xref = _util.asarray_1d(xref)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     d = 4j * _np.exp(-1j*k*n[1]*xref[1]) / _hankel2(0, k*n[1]*xref[1]) * \
         _np.exp(-1j*k*n[0]*x0[:, 0])
     selection = _util.source_selection_all(len(x0))
@@ -203,7 +211,7 @@ def point_25d(omega, x0, n0, xs, *, xref=[0, 0, 0], c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of point source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -218,14 +226,16 @@ def point_25d(omega, x0, n0, xs, *, xref=[0, 0, 0], c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -246,9 +256,9 @@ def point_25d(omega, x0, n0, xs, *, xref=[0, 0, 0], c=None):
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
     xref = _util.asarray_1d(xref)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
+    r = _kernels.norm1d(ds)
     d = 1/2 * 1j * k * _np.sqrt(xref[1] / (xref[1] - xs[1])) * \
         xs[1] / r * _hankel2(1, k * r)
     selection = _util.source_selection_all(len(x0))
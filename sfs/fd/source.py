@@ -24,7 +24,7 @@ r"""Compute the sound field generated by a sound source.
     vgrid = sfs.util.xyz_grid([-2, 3], [-1, 2], 0, spacing=0.1)
 
 """
-from itertools import product as _product
+from collections import namedtuple as _namedtuple
 
 import numpy as _np
 from scipy import special as _special
@@ -33,7 +33,7 @@ from .. import default as _default
 from .. import util as _util
 
 
-def point(omega, x0, grid, *, c=None):
+def point(omega, x0, grid, *, c=None, chunk_points=None, dtype=None):
     r"""Sound pressure of a point source.
 
     Parameters
@@ -47,6 +47,12 @@ def point(omega, x0, grid, *, c=None):
         See `sfs.util.xyz_grid()`.
     c : float, optional
         Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
 
     Returns
     -------
@@ -78,9 +84,14 @@ def point(omega, x0, grid, *, c=None):
         plt.title("Point Source at {} m (normalized)".format(x0))
 
     """
-    k = _util.wavenumber(omega, c)
-    x0 = _util.asarray_1d(x0)
-    grid = _util.as_xyz_components(grid)
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: point(omega, x0, grid, c=c, dtype=dtype),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_1d(x0, dtype=dtype)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
 
     r = _np.linalg.norm(grid - x0)
     # If r is 0, the sound pressure is complex infinity
@@ -89,6 +100,72 @@ def point(omega, x0, grid, *, c=None):
         return numerator / r
 
 
+def point_broadband(omega, x0, grid, *, c=None, chunk_points=None,
+                    dtype=None, resync=64):
+    r"""Sound pressure of a point source for equally spaced frequencies.
+
+    This gives the same result as calling `point()` for each frequency,
+    but the distances to the grid points are only computed once and
+    the complex exponentials are obtained by repeated multiplication
+    with :math:`\e{-\i\frac{\Delta\omega}{c}|\x-\x_0|}`.
+
+    Parameters
+    ----------
+    omega : (F,) array_like
+        Equally spaced frequencies of source.
+    x0 : (3,) array_like
+        Position of source.
+    grid : triple of array_like
+        The grid that is used for the sound field calculations.
+        See `sfs.util.xyz_grid()`.
+    c : float, optional
+        Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
+    resync : int, optional
+        Every *resync* frequencies, the complex exponentials are
+        computed directly in order to limit the accumulation of
+        rounding errors.
+
+    Returns
+    -------
+    (F, ...) numpy.ndarray
+        Sound pressure at positions given by *grid*, one frequency
+        along the first axis.
+
+    Examples
+    --------
+    .. plot::
+        :context: close-figs
+
+        frequencies = np.linspace(100, 1000, 10)
+        p = sfs.fd.source.point_broadband(2 * np.pi * frequencies, x0, grid)
+        sfs.plot2d.amplitude(p[-1], grid)
+        plt.title("Point Source at {} m, {} Hz".format(x0, frequencies[-1]))
+
+    """
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: point_broadband(omega, x0, grid, c=c, dtype=dtype,
+                                         resync=resync),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = _util.wavenumber(_util.asarray_1d(omega), c)
+    x0 = _util.asarray_1d(x0, dtype=dtype)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+
+    r = _np.linalg.norm(grid - x0)
+    p = _phasor_recurrence(k, r, resync)
+    # If r is 0, the sound pressure is complex infinity
+    with _np.errstate(invalid='ignore', divide='ignore'):
+        p *= 1 / (4 * _np.pi * r)
+    return p
+
+
 def point_velocity(omega, x0, grid, *, c=None, rho0=None):
     """Particle velocity of a point source.
 
@@ -173,7 +250,8 @@ def point_averaged_intensity(omega, x0, grid, *, c=None, rho0=None):
     return _util.XyzComponents([i * o / r**2 for o in offset])
 
 
-def point_dipole(omega, x0, n0, grid, *, c=None):
+def point_dipole(omega, x0, n0, grid, *, c=None, chunk_points=None,
+                 dtype=None):
     r"""Point source with dipole characteristics.
 
     Parameters
@@ -189,6 +267,12 @@ def point_dipole(omega, x0, n0, grid, *, c=None):
         See `sfs.util.xyz_grid()`.
     c : float, optional
         Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
 
     Returns
     -------
@@ -214,10 +298,15 @@ def point_dipole(omega, x0, n0, grid, *, c=None):
         plt.title("Dipole Point Source at {} m".format(x0))
 
     """
-    k = _util.wavenumber(omega, c)
-    x0 = _util.asarray_1d(x0)
-    n0 = _util.asarray_1d(n0)
-    grid = _util.as_xyz_components(grid)
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: point_dipole(omega, x0, n0, grid, c=c, dtype=dtype),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_1d(x0, dtype=dtype)
+    n0 = _util.asarray_1d(n0, dtype=dtype)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
 
     offset = grid - x0
     r = _np.linalg.norm(offset)
@@ -225,7 +314,8 @@ def point_dipole(omega, x0, n0, grid, *, c=None):
         _np.power(r, 2) * _np.exp(-1j * k * r)
 
 
-def point_modal(omega, x0, grid, L, *, N=None, deltan=0, c=None):
+def point_modal(omega, x0, grid, L, *, N=None, deltan=0, c=None,
+                basis=None, chunk_points=None):
     """Point source in a rectangular room using a modal room model.
 
     Parameters
@@ -247,6 +337,12 @@ def point_modal(omega, x0, grid, L, *, N=None, deltan=0, c=None):
         Absorption coefficient of the walls.
     c : float, optional
         Speed of sound.
+    basis : `ModalBasis`, optional
+        Pre-computed modal functions, see `modal_basis()`.
+        If given, *grid*, *L* and *N* are not used.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
 
     Returns
     -------
@@ -254,43 +350,22 @@ def point_modal(omega, x0, grid, L, *, N=None, deltan=0, c=None):
         Sound pressure at positions given by *grid*.
 
     """
-    k = _util.wavenumber(omega, c)
-    x0 = _util.asarray_1d(x0)
-    x, y, z = _util.as_xyz_components(grid)
-
-    if _np.isscalar(N):
-        N = N * _np.ones(3, dtype=int)
-
-    if N is None:
-            N = [None, None, None]
-
-    orders = [0, 0, 0]
-    for i in range(3):
-        if N[i] is None:
-            # compute max order
-            orders[i] = range(int(_np.ceil(L[i] / _np.pi * k) + 1))
-        elif _np.isscalar(N[i]):
-            # use given max order
-            orders[i] = range(N[i] + 1)
-        else:
-            # use given orders
-            orders[i] = N[i]
-
-    kmp0 = [((kx + 1j * deltan)**2, _np.cos(kx * x) * _np.cos(kx * x0[0]))
-            for kx in [m * _np.pi / L[0] for m in orders[0]]]
-    kmp1 = [((ky + 1j * deltan)**2, _np.cos(ky * y) * _np.cos(ky * x0[1]))
-            for ky in [n * _np.pi / L[1] for n in orders[1]]]
-    kmp2 = [((kz + 1j * deltan)**2, _np.cos(kz * z) * _np.cos(kz * x0[2]))
-            for kz in [l * _np.pi / L[2] for l in orders[2]]]
-    ksquared = k**2
-    p = 0
-    for (km0, p0), (km1, p1), (km2, p2) in _product(kmp0, kmp1, kmp2):
-        km = km0 + km1 + km2
-        p = p + 8 / (ksquared - km) * p0 * p1 * p2
-    return p
-
-
-def point_modal_velocity(omega, x0, grid, L, *, N=None, deltan=0, c=None):
+    if basis is None:
+        if chunk_points is not None:
+            return _util.evaluate_in_chunks(
+                lambda grid: point_modal(omega, x0, grid, L, N=N,
+                                         deltan=deltan, c=c),
+                grid, chunk_points)
+        k = _util.wavenumber(omega, c)
+        basis = modal_basis(grid, L, _modal_orders(N, L, k))
+    weights, (p0, p1, p2) = _modal_weights(omega, x0, basis, deltan, c)
+    coefficients = (weights * p0[:, None, None] * p1[None, :, None] *
+                    p2[None, None, :])
+    return _modal_sum(coefficients, basis.cos)
+
+
+def point_modal_velocity(omega, x0, grid, L, *, N=None, deltan=0, c=None,
+                         basis=None):
     """Velocity of point source in a rectangular room using a modal room model.
 
     Parameters
@@ -314,6 +389,9 @@ def point_modal_velocity(omega, x0, grid, L, *, N=None, deltan=0, c=None):
         Absorption coefficient of the walls.
     c : float, optional
         Speed of sound.
+    basis : `ModalBasis`, optional
+        Pre-computed modal functions, see `modal_basis()`.
+        If given, *grid*, *L* and *N* are not used.
 
     Returns
     -------
@@ -321,48 +399,125 @@ def point_modal_velocity(omega, x0, grid, L, *, N=None, deltan=0, c=None):
         Particle velocity at positions given by *grid*.
 
     """
+    if basis is None:
+        k = _util.wavenumber(omega, c)
+        if N is None:
+            # determine maximum modal order per dimension
+            orders = [range(int(_np.ceil(l / _np.pi * k))) for l in L]
+        elif _np.isscalar(N):
+            # compute up to a given order
+            orders = [range(N)] * 3
+        else:
+            # compute field for one order combination only
+            orders = [[n] for n in N]
+        basis = modal_basis(grid, L, orders)
+    weights, (p0, p1, p2) = _modal_weights(omega, x0, basis, deltan, c)
+    weights = -1j * weights
+    return _util.XyzComponents([
+        _np.tensordot(weights.sum(axis=(1, 2)) * p0, basis.sin[0], axes=1),
+        _np.tensordot(weights.sum(axis=(0, 2)) * p1, basis.sin[1], axes=1),
+        _np.tensordot(weights.sum(axis=(0, 1)) * p2, basis.sin[2], axes=1),
+    ])
+
+
+ModalBasis = _namedtuple('ModalBasis', 'wavenumbers cos sin')
+"""Modal functions of a rectangular room, see `modal_basis()`.
+
+This class (a `collections.namedtuple`) is not meant to be instantiated
+by users.
+
+"""
+
+
+def modal_basis(grid, L, N):
+    """Pre-compute the modal functions of a rectangular room.
+
+    The modal functions are separable, i.e. they are stored per
+    dimension.  They don't depend on the frequency and on the source
+    position, therefore they can be re-used for multiple calls to
+    `point_modal()` and `point_modal_velocity()`.
+
+    Parameters
+    ----------
+    grid : triple of array_like
+        The grid that is used for the sound field calculations.
+        See `sfs.util.xyz_grid()`.
+    L : (3,) array_like
+        Dimensionons of the rectangular room.
+    N : (3,) array_like or int
+        For all three spatial dimensions per dimension maximum order or
+        list of orders. A scalar applies to all three dimensions.
+
+    Returns
+    -------
+    `ModalBasis`
+        Wavenumbers (a list of three arrays with shape ``(M,)``) and
+        cosine and sine functions evaluated at the grid positions
+        (lists of three arrays with shape ``(M,) + grid[i].shape``).
+
+    Examples
+    --------
+    ::
+
+        basis = sfs.fd.source.modal_basis(grid, L, N)
+        p = [sfs.fd.source.point_modal(omega, x0, grid, L, basis=basis)
+             for omega in omegas]
+
+    """
+    wavenumbers = [_np.asarray(orders) * _np.pi / l
+                   for orders, l in zip(_modal_orders(N, L), L)]
+    arguments = [_np.multiply.outer(kx, x) for kx, x
+                 in zip(wavenumbers, _util.as_xyz_components(grid))]
+    return ModalBasis(wavenumbers,
+                      [_np.cos(a) for a in arguments],
+                      [_np.sin(a) for a in arguments])
+
+
+def _modal_orders(N, L, k=None):
+    """Lists of modal orders for all three dimensions."""
+    if _np.isscalar(N):
+        N = N * _np.ones(3, dtype=int)
+    if N is None:
+        N = [None, None, None]
+    orders = [0, 0, 0]
+    for i in range(3):
+        if N[i] is None:
+            # compute max order
+            orders[i] = range(int(_np.ceil(L[i] / _np.pi * k) + 1))
+        elif _np.isscalar(N[i]):
+            # use given max order
+            orders[i] = range(N[i] + 1)
+        else:
+            # use given orders
+            orders[i] = N[i]
+    return orders
+
+
+def _modal_sum(coefficients, functions):
+    """Sum over all mode combinations, one dimension at a time."""
+    ndim = max(f.ndim for f in functions) - 1
+    # Align grid dimensions, even if the components have different ndim
+    f0, f1, f2 = [f.reshape(f.shape[:1] + (1,) * (ndim + 1 - f.ndim) +
+                            f.shape[1:]) for f in functions]
+    p = _np.tensordot(coefficients, f2, axes=(2, 0))
+    # einsum() doesn't create temporary arrays for the products
+    p = _np.einsum('ij...,j...->i...', p, f1)
+    return _np.einsum('i...,i...->...', p, f0)
+
+
+def _modal_weights(omega, x0, basis, deltan, c):
+    """Weights of all mode combinations and modal functions at source."""
     k = _util.wavenumber(omega, c)
     x0 = _util.asarray_1d(x0)
-    x, y, z = _util.as_xyz_components(grid)
+    kx, ky, kz = [(kw + 1j * deltan)**2 for kw in basis.wavenumbers]
+    km = kx[:, None, None] + ky[None, :, None] + kz[None, None, :]
+    source = [_np.cos(kw * x) for kw, x in zip(basis.wavenumbers, x0)]
+    return 8 / (k**2 - km), source
 
-    if N is None:
-        # determine maximum modal order per dimension
-        Nx = int(_np.ceil(L[0] / _np.pi * k))
-        Ny = int(_np.ceil(L[1] / _np.pi * k))
-        Nz = int(_np.ceil(L[2] / _np.pi * k))
-        mm = range(Nx)
-        nn = range(Ny)
-        ll = range(Nz)
-    elif _np.isscalar(N):
-        # compute up to a given order
-        mm = range(N)
-        nn = range(N)
-        ll = range(N)
-    else:
-        # compute field for one order combination only
-        mm = [N[0]]
-        nn = [N[1]]
-        ll = [N[2]]
-
-    kmp0 = [((kx + 1j * deltan)**2, _np.sin(kx * x) * _np.cos(kx * x0[0]))
-            for kx in [m * _np.pi / L[0] for m in mm]]
-    kmp1 = [((ky + 1j * deltan)**2, _np.sin(ky * y) * _np.cos(ky * x0[1]))
-            for ky in [n * _np.pi / L[1] for n in nn]]
-    kmp2 = [((kz + 1j * deltan)**2, _np.sin(kz * z) * _np.cos(kz * x0[2]))
-            for kz in [l * _np.pi / L[2] for l in ll]]
-    ksquared = k**2
-    vx = 0+0j
-    vy = 0+0j
-    vz = 0+0j
-    for (km0, p0), (km1, p1), (km2, p2) in _product(kmp0, kmp1, kmp2):
-        km = km0 + km1 + km2
-        vx = vx - 8*1j / (ksquared - km) * p0
-        vy = vy - 8*1j / (ksquared - km) * p1
-        vz = vz - 8*1j / (ksquared - km) * p2
-    return _util.XyzComponents([vx, vy, vz])
-
-
-def point_image_sources(omega, x0, grid, L, *, max_order, coeffs=None, c=None):
+
+def point_image_sources(omega, x0, grid, L, *, max_order, coeffs=None, c=None,
+                        chunk_points=None, max_distance=None, threshold=None,
+                        dtype=None):
     """Point source in a rectangular room using the mirror image source model.
 
     Parameters
@@ -383,6 +538,15 @@ def point_image_sources(omega, x0, grid, L, *, max_order, coeffs=None, c=None):
         If not given, the reflection coefficients are set to one.
     c : float, optional
         Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
+    max_distance, threshold : float, optional
+        Discard image sources that are far away from the room or that
+        are weak, see `sfs.util.select_image_sources()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
 
     Returns
     -------
@@ -390,23 +554,35 @@ def point_image_sources(omega, x0, grid, L, *, max_order, coeffs=None, c=None):
         Sound pressure at positions given by *grid*.
 
     """
-    if coeffs is None:
-        coeffs = _np.ones(6)
-
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: point_image_sources(
+                omega, x0, grid, L, max_order=max_order, coeffs=coeffs, c=c,
+                max_distance=max_distance, threshold=threshold, dtype=dtype),
+            grid, chunk_points)
     xs, order = _util.image_sources_for_box(x0, L, max_order)
-    source_strengths = _np.prod(coeffs**order, axis=1)
+    xs, strengths = _util.select_image_sources(
+        xs, order, L, coeffs=coeffs, max_distance=max_distance,
+        threshold=threshold)
 
-    p = 0
-    for position, strength in zip(xs, source_strengths):
-        if strength != 0:
-            # point can be complex infinity
-            with _np.errstate(invalid='ignore'):
-                p += strength * point(omega, position, grid, c=c)
+    dtype = _util.real_dtype(dtype)
+    strengths = strengths.astype(dtype)
 
+    # All image sources of a chunk are evaluated at once
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+    step = max(1, _default.chunk_size // _np.broadcast(*grid).size)
+    p = 0
+    for i in range(0, len(xs), step):
+        # point can be complex infinity
+        with _np.errstate(invalid='ignore'):
+            p += _np.tensordot(
+                strengths[i:i + step],
+                _point_stack(omega, xs[i:i + step], grid, c=c, dtype=dtype),
+                axes=1)
     return p
 
 
-def line(omega, x0, grid, *, c=None):
+def line(omega, x0, grid, *, c=None, chunk_points=None, dtype=None):
     r"""Line source parallel to the z-axis.
 
     Note: third component of x0 is ignored.
@@ -436,9 +612,14 @@ def line(omega, x0, grid, *, c=None):
         plt.title("Line Source at {} m (normalized)".format(x0[:2]))
 
     """
-    k = _util.wavenumber(omega, c)
-    x0 = _util.asarray_1d(x0)[:2]  # ignore z-component
-    grid = _util.as_xyz_components(grid)
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: line(omega, x0, grid, c=c, dtype=dtype),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_1d(x0, dtype=dtype)[:2]  # ignore z-component
+    grid = _util.as_xyz_components(grid, dtype=dtype)
 
     r = _np.linalg.norm(grid[:2] - x0)
     p = -1j/4 * _hankel2_0(k * r)
@@ -487,7 +668,8 @@ def line_velocity(omega, x0, grid, *, c=None, rho0=None):
     return _util.XyzComponents([_duplicate_zdirection(vi, grid) for vi in v])
 
 
-def line_dipole(omega, x0, n0, grid, *, c=None):
+def line_dipole(omega, x0, n0, grid, *, c=None, chunk_points=None,
+                dtype=None):
     r"""Line source with dipole characteristics parallel to the z-axis.
 
     Note: third component of x0 is ignored.
@@ -499,10 +681,15 @@ def line_dipole(omega, x0, n0, grid, *, c=None):
         G(\x-\x_0,\w) = \frac{\i k}{4} \Hankel{2}{1}{\wc|\x-\x_0|} \cos{\phi}
 
     """
-    k = _util.wavenumber(omega, c)
-    x0 = _util.asarray_1d(x0)[:2]  # ignore z-components
-    n0 = _util.asarray_1d(n0)[:2]
-    grid = _util.as_xyz_components(grid)
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: line_dipole(omega, x0, n0, grid, c=c, dtype=dtype),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_1d(x0, dtype=dtype)[:2]  # ignore z-components
+    n0 = _util.asarray_1d(n0, dtype=dtype)[:2]
+    grid = _util.as_xyz_components(grid, dtype=dtype)
     dx = grid[:2] - x0
 
     r = _np.linalg.norm(dx)
@@ -545,38 +732,37 @@ def line_dirichlet_edge(omega, x0, grid, *, alpha=_np.pi*3/2, Nc=None, c=None):
         phi_s = phi_s + 2 * _np.pi
     r_s = _np.linalg.norm(x0)
 
-    grid = _util.XyzComponents(grid)
+    grid = _util.as_xyz_components(grid)
 
-    r = _np.linalg.norm(grid[:2])
+    r = _np.sqrt(grid[0]**2 + grid[1]**2)
     phi = _np.arctan2(grid[1], grid[0])
     phi = _np.where(phi < 0, phi + 2 * _np.pi, phi)
 
     if Nc is None:
-        Nc = _np.ceil(2 * k * _np.max(r) * alpha / _np.pi)
+        Nc = int(_np.ceil(2 * k * _np.max(r) * alpha / _np.pi))
 
     epsilon = _np.ones(Nc)  # weights for series expansion
     epsilon[0] = 2
 
-    p = _np.zeros((grid[0].shape[1], grid[1].shape[0]), dtype=complex)
-    idxr = (r <= r_s)
-    idxa = (phi <= alpha)
-    for m in _np.arange(Nc):
-        nu = m * _np.pi / alpha
-        f = 1/epsilon[m] * _np.sin(nu*phi_s) * _np.sin(nu*phi)
-        p[idxr & idxa] = p[idxr & idxa] + f[idxr & idxa] * \
-            _special.jn(nu, k*r[idxr & idxa]) * _special.hankel2(nu, k*r_s)
-        p[~idxr & idxa] = p[~idxr & idxa] + f[~idxr & idxa] * \
-            _special.jn(nu, k*r_s) * _special.hankel2(nu, k*r[~idxr & idxa])
+    # All orders at once, along the last axis
+    nu = _np.arange(Nc) * _np.pi / alpha
+    r = r[..., _np.newaxis]
+    f = 1/epsilon * _np.sin(nu*phi_s) * _np.sin(nu*phi[..., _np.newaxis])
+    p = _np.sum(
+        f * _util.special_function_table('jn', nu, k * _np.minimum(r, r_s))
+        * _util.special_function_table('hankel2', nu,
+                                       k * _np.maximum(r, r_s)),
+        axis=-1)
 
     p = p * -1j * _np.pi / alpha
 
-    pl = line(omega, x0, None, grid, c=c)
-    p[~idxa] = pl[~idxa]
+    pl = line(omega, x0, grid, c=c)
+    p = _np.where(phi <= alpha, p, pl)
 
     return p
 
 
-def plane(omega, x0, n0, grid, *, c=None):
+def plane(omega, x0, n0, grid, *, c=None, chunk_points=None, dtype=None):
     r"""Plane wave.
 
     Parameters
@@ -592,6 +778,12 @@ def plane(omega, x0, n0, grid, *, c=None):
         See `sfs.util.xyz_grid()`.
     c : float, optional
         Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
 
     Returns
     -------
@@ -616,13 +808,70 @@ def plane(omega, x0, n0, grid, *, c=None):
         plt.title("Plane wave with direction {} degree".format(direction))
 
     """
-    k = _util.wavenumber(omega, c)
-    x0 = _util.asarray_1d(x0)
-    n0 = _util.normalize_vector(n0)
-    grid = _util.as_xyz_components(grid)
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: plane(omega, x0, n0, grid, c=c, dtype=dtype),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_1d(x0, dtype=dtype)
+    n0 = _util.normalize_vector(n0).astype(dtype)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
     return _np.exp(-1j * k * _np.inner(grid - x0, n0))
 
 
+def plane_broadband(omega, x0, n0, grid, *, c=None, chunk_points=None,
+                    dtype=None, resync=64):
+    r"""Plane wave for equally spaced frequencies.
+
+    Like `point_broadband()`, the projected distances to the grid points
+    are computed only once and the complex exponentials for all
+    frequencies are obtained by repeated multiplication.
+
+    Parameters
+    ----------
+    omega : (F,) array_like
+        Equally spaced frequencies of plane wave.
+    x0 : (3,) array_like
+        Position of plane wave.
+    n0 : (3,) array_like
+        Normal vector (direction) of plane wave.
+    grid : triple of array_like
+        The grid that is used for the sound field calculations.
+        See `sfs.util.xyz_grid()`.
+    c : float, optional
+        Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
+    resync : int, optional
+        Every *resync* frequencies, the complex exponentials are
+        computed directly in order to limit the accumulation of
+        rounding errors.
+
+    Returns
+    -------
+    (F, ...) numpy.ndarray
+        Sound pressure at positions given by *grid*, one frequency
+        along the first axis.
+
+    """
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: plane_broadband(omega, x0, n0, grid, c=c,
+                                         dtype=dtype, resync=resync),
+            grid, chunk_points)
+    dtype = _util.real_dtype(dtype)
+    k = _util.wavenumber(_util.asarray_1d(omega), c)
+    x0 = _util.asarray_1d(x0, dtype=dtype)
+    n0 = _util.normalize_vector(n0).astype(dtype)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+    return _phasor_recurrence(k, _np.inner(grid - x0, n0), resync)
+
+
 def plane_velocity(omega, x0, n0, grid, *, c=None, rho0=None):
     r"""Velocity of a plane wave.
 
@@ -714,7 +963,7 @@ def plane_averaged_intensity(omega, x0, n0, grid, *, c=None, rho0=None):
 
 
 def pulsating_sphere(omega, center, radius, amplitude, grid, *, inside=False,
-                     c=None):
+                     c=None, chunk_points=None):
     """Sound pressure of a pulsating sphere.
 
     Parameters
@@ -735,6 +984,9 @@ def pulsating_sphere(omega, center, radius, amplitude, grid, *, inside=False,
         If ``inside=True``, the sound field inside the sphere is extrapolated.
     c : float, optional
         Speed of sound.
+    chunk_points : int, optional
+        If given, the sound field is computed in chunks of at most this
+        many grid points, see `sfs.util.evaluate_in_chunks()`.
 
     Returns
     -------
@@ -755,6 +1007,11 @@ def pulsating_sphere(omega, center, radius, amplitude, grid, *, inside=False,
         plt.title("Sound Pressure of a Pulsating Sphere")
 
     """
+    if chunk_points is not None:
+        return _util.evaluate_in_chunks(
+            lambda grid: pulsating_sphere(omega, center, radius, amplitude,
+                                          grid, inside=inside, c=c),
+            grid, chunk_points)
     if c is None:
         c = _default.c
     k = _util.wavenumber(omega, c)
@@ -824,6 +1081,80 @@ def pulsating_sphere_velocity(omega, center, radius, amplitude, grid, *,
         [radial_velocity * o / distance for o in offset])
 
 
+def _phasor_recurrence(k, distance, resync):
+    """Compute exp(-1j * k * distance) for equally spaced wavenumbers.
+
+    Returns an array with one wavenumber along the first axis.
+
+    """
+    distance = _np.asarray(distance)
+    if k.size > 1:
+        dk = (k[-1] - k[0]) / (k.size - 1)
+        if not _np.allclose(_np.diff(k), dk, rtol=1e-6, atol=0):
+            raise ValueError('Frequencies must be equally spaced')
+    else:
+        dk = 0
+    if resync < 1:
+        raise ValueError('resync must be a positive integer')
+    k = k.astype(distance.dtype)
+    p = _np.empty(k.shape + distance.shape,
+                  dtype=_np.result_type(distance.dtype, _np.complex64))
+    step = _np.exp(-1j * distance.dtype.type(dk) * distance)
+    for i, ki in enumerate(k):
+        if i % resync == 0:
+            _np.exp(-1j * ki * distance, out=p[i])
+        else:
+            _np.multiply(p[i - 1], step, out=p[i])
+    return p
+
+
+def _point_stack(omega, x0, grid, *, c=None, dtype=None):
+    """Sound pressure of several point sources, stacked along a new axis.
+
+    Like `point()`, but *x0* has shape ``(C, 3)`` and the result has
+    shape ``(C,) + grid_shape``.
+
+    """
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_of_rows(x0, dtype=dtype)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+
+    r = _np.linalg.norm(_stacked_offset(grid, x0))
+    numerator = _np.exp(-1j * k * r) / (4 * _np.pi)
+    with _np.errstate(invalid='ignore', divide='ignore'):
+        return numerator / r
+
+
+def _line_stack(omega, x0, grid, *, c=None, dtype=None):
+    """Sound pressure of several line sources, stacked along a new axis.
+
+    Like `line()`, but *x0* has shape ``(C, 3)`` and the result has
+    shape ``(C,) + grid_shape``.
+
+    """
+    dtype = _util.real_dtype(dtype)
+    k = dtype.type(_util.wavenumber(omega, c))
+    x0 = _util.asarray_of_rows(x0, dtype=dtype)[:, :2]  # ignore z-component
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+
+    r = _np.linalg.norm(_stacked_offset(grid[:2], x0))
+    p = -1j/4 * _hankel2_0(k * r)
+    return _duplicate_zdirection(p, grid)
+
+
+def _stacked_offset(grid, x0):
+    """Offsets between *grid* and all rows of *x0*.
+
+    The offsets of the individual positions are stacked along a new
+    first axis of each component.
+
+    """
+    ndim = _np.broadcast(*grid).ndim
+    return _util.XyzComponents([
+        g - _np.reshape(x, (-1,) + (1,) * ndim) for g, x in zip(grid, x0.T)])
+
+
 def _duplicate_zdirection(p, grid):
     """If necessary, duplicate field in z-direction."""
     gridshape = _np.broadcast(*grid).shape
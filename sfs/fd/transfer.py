@@ -0,0 +1,425 @@
+"""Compressed transfer operators from secondary sources to a grid.
+
+The sound field synthesized by `sfs.fd.synthesize()` is the product of
+a transfer matrix :math:`G` with shape ``(M, N)`` (M grid points, N
+secondary sources) and the vector of driving functions (including
+weights).  For large grids this matrix is too big to be stored, but it
+is typically highly compressible.
+
+`LowRankTransfer` approximates the whole matrix with a truncated SVD,
+`HierarchicalTransfer` splits it into blocks of nearby and well-separated
+groups of sources and grid points (an H-matrix), where only the latter
+are compressed.  The costs of the hierarchical approximation grow
+roughly linearly with the number of sources and grid points.
+
+.. include:: math-definitions.rst
+
+"""
+from collections import namedtuple as _namedtuple
+
+import numpy as _np
+
+from . import _secondary_source_fields
+from .. import array as _array
+from .. import default as _default
+from .. import util as _util
+
+
+class LowRankTransfer:
+    r"""Low-rank approximation of a transfer matrix.
+
+    The transfer matrix :math:`G` from the secondary sources to the grid
+    points is approximated by a truncated singular value decomposition
+    :math:`G \approx U \operatorname{diag}(s) V^H`, which is computed
+    with a blocked, adaptive randomized range finder
+    :cite:`Halko2011`.  The matrix :math:`G` itself is never stored,
+    it is evaluated in chunks of grid points whenever it is multiplied
+    with a block of random vectors.  The block size is doubled after
+    each pass, therefore only about :math:`\log_2(K)` passes are needed
+    for rank :math:`K`.
+
+    Parameters
+    ----------
+    ssd : sequence of between 1 and 3 array_like objects
+        Positions, normal vectors and weights of secondary sources.
+        A `SecondarySourceDistribution` can also be used.
+    secondary_source_function : callable
+        A function that generates the sound field of a secondary source,
+        see `sfs.fd.synthesize()`.  A vectorized function (like
+        `sfs.fd.secondary_source_point()`) is much faster.
+    grid : triple of array_like
+        The grid that is used for the sound field calculations.
+        See `sfs.util.xyz_grid()`.
+    tolerance : float, optional
+        Relative error of the approximation (in the Frobenius norm).
+        The error of the range finder is estimated with random vectors.
+    max_rank : int, optional
+        Upper limit for the rank, by default ``min(M, N)``.
+    blocksize : int, optional
+        Number of random vectors in the first pass over the grid.
+    chunk_points : int, optional
+        Maximum number of grid points for which the sound fields of all
+        secondary sources are computed at once.  By default, chunks
+        have up to ``sfs.default.chunk_size`` elements.
+    seed : int or `numpy.random.Generator`, optional
+        Seed for the random vectors.
+    **kwargs
+        All further keyword arguments are forwarded to
+        *secondary_source_function*.
+
+    Attributes
+    ----------
+    U : (M, K) numpy.ndarray
+        Left singular vectors, for the flattened grid.
+    s : (K,) numpy.ndarray
+        Singular values.
+    Vh : (K, N) numpy.ndarray
+        Conjugate transposed right singular vectors.
+    shape : tuple of int
+        Shape of the grid (and of the synthesized sound fields).
+
+    Examples
+    --------
+    ::
+
+        d, selection, secondary_source = sfs.fd.wfs.point_25d(
+            omega, array.x, array.n, xs)
+        G = sfs.fd.transfer.LowRankTransfer(array, secondary_source, grid)
+        p = G.apply(d * selection)
+        # like sfs.fd.synthesize(d, selection, array, secondary_source,
+        #                        grid=grid)
+
+    """
+
+    def __init__(self, ssd, secondary_source_function, grid, *,
+                 tolerance=1e-3, max_rank=None, blocksize=16,
+                 chunk_points=None, seed=None, **kwargs):
+        ssd = _array.as_secondary_source_distribution(ssd)
+        grid = _util.as_xyz_components(grid)
+        self.shape = _np.broadcast(*grid).shape
+        M, N = int(_np.prod(self.shape)), len(ssd.x)
+        if chunk_points is None:
+            chunk_points = max(1, _default.chunk_size // N)
+
+        def chunks():
+            """Rows of G for chunks of grid points."""
+            start = 0
+            for _, chunk in _util.grid_chunks(grid, chunk_points):
+                fields = _secondary_source_fields(
+                    ssd, slice(None), secondary_source_function,
+                    grid=chunk, **kwargs)
+                rows = fields.reshape(N, -1).T * ssd.a
+                if not _np.isfinite(rows).all():
+                    raise ValueError(
+                        'Non-finite sound field values '
+                        '(grid points at secondary source positions?)')
+                yield slice(start, start + len(rows)), rows
+                start += len(rows)
+
+        # The squared errors of range finder and truncation add up
+        tolerance = tolerance / _np.sqrt(2)
+        if max_rank is None:
+            max_rank = min(M, N)
+        rng = _np.random.default_rng(seed)
+        Q = _np.zeros((M, 0), dtype=complex)
+        reference = None
+        while Q.shape[1] < max_rank:
+            test_matrix = rng.standard_normal(
+                (N, min(blocksize, max_rank - Q.shape[1])))
+            blocksize *= 2
+            Y = _np.empty((M, test_matrix.shape[1]), dtype=complex)
+            for index, rows in chunks():
+                Y[index] = rows @ test_matrix
+            # Norms of G @ test_matrix estimate the Frobenius norm of G
+            if reference is None:
+                reference = _np.linalg.norm(Y) / _np.sqrt(test_matrix.shape[1])
+            Y -= Q @ (Q.conj().T @ Y)
+            error = _np.linalg.norm(Y) / _np.sqrt(test_matrix.shape[1])
+            if error <= tolerance * reference:
+                break
+            Y -= Q @ (Q.conj().T @ Y)  # re-orthogonalize
+            Q = _np.column_stack([Q, _np.linalg.qr(Y)[0]])
+        B = _np.zeros((Q.shape[1], N), dtype=complex)
+        for index, rows in chunks():
+            B += Q[index].conj().T @ rows
+        u, s, self.Vh = _np.linalg.svd(B, full_matrices=False)
+        # Remaining error for each possible rank
+        tail = _np.sqrt(_np.cumsum(s[::-1]**2)[::-1])
+        rank = _np.count_nonzero(tail > tolerance * _np.linalg.norm(s))
+        self.U = Q @ u[:, :rank]
+        self.s = s[:rank]
+        self.Vh = self.Vh[:rank]
+
+    @property
+    def rank(self):
+        """Rank of the approximation."""
+        return len(self.s)
+
+    def apply(self, d):
+        """Compute sound field for given (weighted) driving functions.
+
+        Parameters
+        ----------
+        d : (N,) or (..., N) array_like
+            Driving function, including all weights (i.e. ``d * weights``
+            in terms of `sfs.fd.synthesize()`).  Leading dimensions
+            are used for several driving functions.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sound field with shape `shape` (preceded by the leading
+            dimensions of *d*).
+
+        """
+        p = (_np.asarray(d) @ self.Vh.T * self.s) @ self.U.T
+        return p.reshape(p.shape[:-1] + self.shape)
+
+    def adjoint(self, p):
+        """Apply the conjugate transpose of the transfer matrix.
+
+        This can be used for least-squares designs of driving functions.
+
+        Parameters
+        ----------
+        p : array_like
+            Sound field with shape `shape`, optionally preceded by
+            further dimensions.
+
+        Returns
+        -------
+        (N,) or (..., N) numpy.ndarray
+            Result for each secondary source.
+
+        """
+        p = _np.asarray(p)
+        p = p.reshape(p.shape[:p.ndim - len(self.shape)] + (-1,))
+        return (p @ self.U.conj() * self.s) @ self.Vh.conj()
+
+
+class HierarchicalTransfer:
+    r"""Hierarchical (H-matrix) approximation of a transfer matrix.
+
+    Secondary sources and grid points are recursively split into
+    clusters (by bisection along the largest extent of their bounding
+    boxes).  Blocks of the transfer matrix :math:`G` between clusters
+    that are well separated compared to their size are approximated by
+    low-rank products :math:`U V`, which are obtained by adaptive cross
+    approximation (ACA) with partial pivoting :cite:`Bebendorf2000`:
+    only a few rows and columns of each block are evaluated.
+    All other blocks are small and stored as dense matrices.
+    Building and applying the approximation needs roughly
+    :math:`O(N + M)` operations (for moderate frequencies).
+
+    Parameters
+    ----------
+    ssd : sequence of between 1 and 3 array_like objects
+        Positions, normal vectors and weights of secondary sources.
+        A `SecondarySourceDistribution` can also be used.
+    secondary_source_function : callable
+        A function that generates the sound field of a secondary source,
+        e.g. `sfs.fd.secondary_source_point()` or
+        `sfs.fd.secondary_source_line()`.  It is called with point
+        clouds (one-dimensional grid components) as *grid*.
+    grid : triple of array_like
+        The grid that is used for the sound field calculations.
+        See `sfs.util.xyz_grid()`.
+    tolerance : float, optional
+        Relative error (in the Frobenius norm) of each low-rank block.
+    leaf_size : int, optional
+        Clusters with up to this many points are not split further.
+    eta : float, optional
+        Two clusters are well separated if the smaller diameter of their
+        bounding boxes is at most *eta* times their distance.
+    **kwargs
+        All further keyword arguments are forwarded to
+        *secondary_source_function*.
+
+    Attributes
+    ----------
+    shape : tuple of int
+        Shape of the grid (and of the synthesized sound fields).
+    compression : float
+        Number of stored matrix elements relative to the full matrix.
+
+    See Also
+    --------
+    LowRankTransfer
+
+    Examples
+    --------
+    ::
+
+        d, selection, secondary_source = sfs.fd.wfs.point_25d(
+            omega, array.x, array.n, xs)
+        G = sfs.fd.transfer.HierarchicalTransfer(
+            array, secondary_source, grid, tolerance=1e-4)
+        p = G.apply(d * selection)
+
+    """
+
+    def __init__(self, ssd, secondary_source_function, grid, *,
+                 tolerance=1e-3, leaf_size=64, eta=1, **kwargs):
+        ssd = _array.as_secondary_source_distribution(ssd)
+        grid = _util.as_xyz_components(grid)
+        self.shape = _np.broadcast(*grid).shape
+        points = _np.zeros((int(_np.prod(self.shape)), 3))
+        for i, component in enumerate(grid):
+            points[:, i] = _np.broadcast_to(component, self.shape).ravel()
+        self._target_order, targets = _cluster_tree(points, leaf_size)
+        self._source_order, sources = _cluster_tree(ssd.x, leaf_size)
+        points = points[self._target_order]
+        ssd = _array.SecondarySourceDistribution(
+            *(a[self._source_order] for a in ssd))
+
+        def block(rows, columns):
+            fields = _secondary_source_fields(
+                ssd, columns, secondary_source_function,
+                grid=_util.XyzComponents(list(points[rows].T)), **kwargs)
+            return fields.reshape(len(ssd.x[columns]), -1).T * ssd.a[columns]
+
+        self._low_rank = []
+        self._dense = []
+        blocks = [(targets, sources)]
+        while blocks:
+            t, s = blocks.pop()
+            if _admissible(t, s, eta):
+                factors = _aca(
+                    lambda i: block(slice(t.index.start + i,
+                                          t.index.start + i + 1),
+                                    s.index)[0],
+                    lambda j: block(t.index,
+                                    slice(s.index.start + j,
+                                          s.index.start + j + 1))[:, 0],
+                    (t.size, s.size), tolerance)
+                if factors is not None:
+                    self._low_rank.append((t.index, s.index) + factors)
+                    continue
+            if not t.children and not s.children:
+                self._dense.append((t.index, s.index, block(t.index,
+                                                            s.index)))
+            elif t.children and (not s.children or t.size >= s.size):
+                blocks.extend((child, s) for child in t.children)
+            else:
+                blocks.extend((t, child) for child in s.children)
+        stored = sum(U.size + V.size for _, _, U, V in self._low_rank)
+        stored += sum(D.size for _, _, D in self._dense)
+        self.compression = stored / (targets.size * sources.size)
+
+    def apply(self, d):
+        """Compute sound field for given (weighted) driving functions.
+
+        See `LowRankTransfer.apply()`.
+
+        """
+        d = _np.asarray(d)[..., self._source_order]
+        p = _np.zeros(d.shape[:-1] + (len(self._target_order),),
+                      dtype=complex)
+        for rows, columns, U, V in self._low_rank:
+            p[..., rows] += d[..., columns] @ V.T @ U.T
+        for rows, columns, D in self._dense:
+            p[..., rows] += d[..., columns] @ D.T
+        result = _np.empty_like(p)
+        result[..., self._target_order] = p
+        return result.reshape(p.shape[:-1] + self.shape)
+
+    def adjoint(self, p):
+        """Apply the conjugate transpose of the transfer matrix.
+
+        See `LowRankTransfer.adjoint()`.
+
+        """
+        p = _np.asarray(p)
+        p = p.reshape(p.shape[:p.ndim - len(self.shape)] + (-1,))
+        p = p[..., self._target_order]
+        d = _np.zeros(p.shape[:-1] + (len(self._source_order),),
+                      dtype=complex)
+        for rows, columns, U, V in self._low_rank:
+            d[..., columns] += p[..., rows] @ U.conj() @ V.conj()
+        for rows, columns, D in self._dense:
+            d[..., columns] += p[..., rows] @ D.conj()
+        result = _np.empty_like(d)
+        result[..., self._source_order] = d
+        return result
+
+
+class _Cluster(_namedtuple('_Cluster', 'index lower upper children')):
+    """Contiguous range of points with bounding box and sub-clusters."""
+
+    __slots__ = ()
+
+    @property
+    def size(self):
+        return self.index.stop - self.index.start
+
+
+def _cluster_tree(points, leaf_size):
+    """Split *points* recursively, return permutation and root cluster.
+
+    After the permutation, each cluster is a contiguous range of points.
+
+    """
+    order = _np.arange(len(points))
+
+    def split(start, stop):
+        p = points[order[start:stop]]
+        lower, upper = p.min(axis=0), p.max(axis=0)
+        children = ()
+        if stop - start > leaf_size:
+            middle = (start + stop) // 2
+            axis = _np.argmax(upper - lower)
+            order[start:stop] = order[start:stop][
+                _np.argpartition(p[:, axis], middle - start)]
+            children = split(start, middle), split(middle, stop)
+        return _Cluster(slice(start, stop), lower, upper, children)
+
+    root = split(0, len(points))
+    return order, root
+
+
+def _admissible(t, s, eta):
+    """Check if two clusters are well separated."""
+    gap = _np.maximum(0, _np.maximum(s.lower - t.upper, t.lower - s.upper))
+    distance = _np.linalg.norm(gap)
+    diameter = min(_np.linalg.norm(t.upper - t.lower),
+                   _np.linalg.norm(s.upper - s.lower))
+    return distance > 0 and diameter <= eta * distance
+
+
+def _aca(row, column, shape, tolerance):
+    """Adaptive cross approximation with partial pivoting.
+
+    Returns factors ``(U, V)`` with shapes ``(m, k)`` and ``(k, n)``,
+    or ``None`` if a dense matrix would need less memory.
+
+    """
+    m, n = shape
+    max_rank = m * n // (m + n)
+    us, vs = _np.zeros((0, m), dtype=complex), _np.zeros((0, n), complex)
+    norm2 = 0
+    unused = _np.ones(m, dtype=bool)
+    i = 0
+    while len(us) < max_rank:
+        unused[i] = False
+        r = row(i) - us[:, i] @ vs
+        j = _np.argmax(_np.abs(r))
+        if r[j] == 0:
+            if not unused.any():
+                break  # exact
+            i = _np.argmax(unused)
+            continue
+        v = r / r[j]
+        u = column(j) - vs[:, j] @ us
+        norm2 += (_np.vdot(u, u) * _np.vdot(v, v)).real + 2 * (
+            (us.conj() @ u) * (vs.conj() @ v)).sum().real
+        us = _np.vstack([us, u])
+        vs = _np.vstack([vs, v])
+        if (_np.linalg.norm(u) * _np.linalg.norm(v) <=
+                tolerance * _np.sqrt(norm2)):
+            break
+        if not unused.any():
+            break  # exact
+        i = _np.argmax(_np.where(unused, _np.abs(u), -1))
+    else:
+        return None
+    return us.T, vs
@@ -32,11 +32,13 @@
 
 """
 import numpy as _np
-from numpy.core.umath_tests import inner1d as _inner1d
 from scipy.special import hankel2 as _hankel2
 
+from . import _as_frequency_column
 from . import secondary_source_line as _secondary_source_line
 from . import secondary_source_point as _secondary_source_point
+from .. import _kernels
+from .. import default as _default
 from .. import util as _util
 
 
@@ -45,7 +47,7 @@ def line_2d(omega, x0, n0, xs, *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of line source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -58,14 +60,16 @@ def line_2d(omega, x0, n0, xs, *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -88,10 +92,10 @@ def line_2d(omega, x0, n0, xs, *, c=None):
     x0 = _util.asarray_of_rows(x0)
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
-    d = -1j/2 * k * _inner1d(ds, n0) / r * _hankel2(1, k * r)
+    r = _kernels.norm1d(ds)
+    d = -1j/2 * k * _kernels.inner1d(ds, n0) / r * _hankel2(1, k * r)
     selection = _util.source_selection_line(n0, x0, xs)
     return d, selection, _secondary_source_line(omega, c)
 
@@ -101,7 +105,7 @@ def _point(omega, x0, n0, xs, *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of point source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -114,14 +118,16 @@ def _point(omega, x0, n0, xs, *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -144,10 +150,10 @@ def _point(omega, x0, n0, xs, *, c=None):
     x0 = _util.asarray_of_rows(x0)
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
-    d = 1j * k * _inner1d(ds, n0) / r ** (3 / 2) * _np.exp(-1j * k * r)
+    r = _kernels.norm1d(ds)
+    d = 1j * k * _kernels.inner1d(ds, n0) / r ** (3 / 2) * _np.exp(-1j * k * r)
     selection = _util.source_selection_point(n0, x0, xs)
     return d, selection, _secondary_source_point(omega, c)
 
@@ -163,7 +169,7 @@ def point_25d(omega, x0, n0, xs, xref=[0, 0, 0], c=None, omalias=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of point source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -181,14 +187,16 @@ def point_25d(omega, x0, n0, xs, xref=[0, 0, 0], c=None, omalias=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -224,18 +232,18 @@ def point_25d(omega, x0, n0, xs, xref=[0, 0, 0], c=None, omalias=None):
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
     xref = _util.asarray_1d(xref)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
 
     ds = x0 - xs
     dr = xref - x0
-    s = _np.linalg.norm(ds, axis=1)
-    r = _np.linalg.norm(dr, axis=1)
+    s = _kernels.norm1d(ds)
+    r = _kernels.norm1d(dr)
 
     d = (
-        preeq_25d(omega, omalias, c) *
+        preeq_25d(_as_frequency_column(omega), omalias, c) *
         _np.sqrt(8 * _np.pi) *
         _np.sqrt((r * s) / (r + s)) *
-        _inner1d(n0, ds) / s *
+        _kernels.inner1d(n0, ds) / s *
         _np.exp(-1j * k * s) / (4 * _np.pi * s))
     selection = _util.source_selection_point(n0, x0, xs)
     return d, selection, _secondary_source_point(omega, c)
@@ -254,7 +262,7 @@ def point_25d_legacy(omega, x0, n0, xs, xref=[0, 0, 0], c=None, omalias=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of point source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -271,14 +279,16 @@ def point_25d_legacy(omega, x0, n0, xs, xref=[0, 0, 0], c=None, omalias=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -312,12 +322,12 @@ def point_25d_legacy(omega, x0, n0, xs, xref=[0, 0, 0], c=None, omalias=None):
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
     xref = _util.asarray_1d(xref)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
+    r = _kernels.norm1d(ds)
     d = (
-        preeq_25d(omega, omalias, c) *
-        _np.sqrt(_np.linalg.norm(xref - x0)) * _inner1d(ds, n0) /
+        preeq_25d(_as_frequency_column(omega), omalias, c) *
+        _np.sqrt(_np.linalg.norm(xref - x0)) * _kernels.inner1d(ds, n0) /
         r ** (3 / 2) * _np.exp(-1j * k * r))
     selection = _util.source_selection_point(n0, x0, xs)
     return d, selection, _secondary_source_point(omega, c)
@@ -328,7 +338,7 @@ def _plane(omega, x0, n0, n=[0, 1, 0], *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of plane wave.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -341,14 +351,16 @@ def _plane(omega, x0, n0, n=[0, 1, 0], *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -372,7 +384,7 @@ def _plane(omega, x0, n0, n=[0, 1, 0], *, c=None):
     x0 = _util.asarray_of_rows(x0)
     n0 = _util.asarray_of_rows(n0)
     n = _util.normalize_vector(n)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     d = 2j * k * _np.inner(n, n0) * _np.exp(-1j * k * _np.inner(n, x0))
     selection = _util.source_selection_plane(n0, n)
     return d, selection, _secondary_source_point(omega, c)
@@ -387,7 +399,7 @@ def plane_25d(omega, x0, n0, n=[0, 1, 0], *, xref=[0, 0, 0], c=None,
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of plane wave.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -404,14 +416,16 @@ def plane_25d(omega, x0, n0, n=[0, 1, 0], *, xref=[0, 0, 0], c=None,
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -435,10 +449,10 @@ def plane_25d(omega, x0, n0, n=[0, 1, 0], *, xref=[0, 0, 0], c=None,
     n0 = _util.asarray_of_rows(n0)
     n = _util.normalize_vector(n)
     xref = _util.asarray_1d(xref)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     d = (
-        preeq_25d(omega, omalias, c) *
-        _np.sqrt(8 * _np.pi * _np.linalg.norm(xref - x0, axis=-1)) *
+        preeq_25d(_as_frequency_column(omega), omalias, c) *
+        _np.sqrt(8 * _np.pi * _kernels.norm1d(xref - x0)) *
         _np.inner(n, n0) * _np.exp(-1j * k * _np.inner(n, x0)))
     selection = _util.source_selection_plane(n0, n)
     return d, selection, _secondary_source_point(omega, c)
@@ -452,7 +466,7 @@ def _focused(omega, x0, n0, xs, ns, *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of focused source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -467,14 +481,16 @@ def _focused(omega, x0, n0, xs, ns, *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -497,10 +513,10 @@ def _focused(omega, x0, n0, xs, ns, *, c=None):
     x0 = _util.asarray_of_rows(x0)
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
-    d = 1j * k * _inner1d(ds, n0) / r ** (3 / 2) * _np.exp(1j * k * r)
+    r = _kernels.norm1d(ds)
+    d = 1j * k * _kernels.inner1d(ds, n0) / r ** (3 / 2) * _np.exp(1j * k * r)
     selection = _util.source_selection_focused(ns, x0, xs)
     return d, selection, _secondary_source_point(omega, c)
 
@@ -514,7 +530,7 @@ def focused_25d(omega, x0, n0, xs, ns, *, xref=[0, 0, 0], c=None,
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of focused source.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -533,14 +549,16 @@ def focused_25d(omega, x0, n0, xs, ns, *, xref=[0, 0, 0], c=None,
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -565,12 +583,12 @@ def focused_25d(omega, x0, n0, xs, ns, *, xref=[0, 0, 0], c=None,
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
     xref = _util.asarray_1d(xref)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
+    r = _kernels.norm1d(ds)
     d = (
-        preeq_25d(omega, omalias, c) *
-        _np.sqrt(_np.linalg.norm(xref - x0)) * _inner1d(ds, n0) /
+        preeq_25d(_as_frequency_column(omega), omalias, c) *
+        _np.sqrt(_np.linalg.norm(xref - x0)) * _kernels.inner1d(ds, n0) /
         r ** (3 / 2) * _np.exp(1j * k * r))
     selection = _util.source_selection_focused(ns, x0, xs)
     return d, selection, _secondary_source_point(omega, c)
@@ -584,7 +602,7 @@ def preeq_25d(omega, omalias, c):
 
     Parameters
     ----------
-    omega : float
+    omega : float or array_like
         Angular frequency.
     omalias: float
         Angular frequency where spatial aliasing becomes prominent.
@@ -593,7 +611,7 @@ def preeq_25d(omega, omalias, c):
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Complex weight for given angular frequency.
 
     Notes
@@ -607,13 +625,9 @@ def preeq_25d(omega, omalias, c):
             \end{cases}
 
     """
-    if omalias is None:
-        return _np.sqrt(1j * _util.wavenumber(omega, c))
-    else:
-        if omega <= omalias:
-            return _np.sqrt(1j * _util.wavenumber(omega, c))
-        else:
-            return _np.sqrt(1j * _util.wavenumber(omalias, c))
+    if omalias is not None:
+        omega = _np.minimum(omega, omalias)
+    return _np.sqrt(1j * _util.wavenumber(omega, c))
 
 
 def plane_3d_delay(omega, x0, n0, n=[0, 1, 0], *, c=None):
@@ -621,7 +635,7 @@ def plane_3d_delay(omega, x0, n0, n=[0, 1, 0], *, c=None):
 
     Parameters
     ----------
-    omega : float
+    omega : float or (F,) array_like
         Angular frequency of plane wave.
     x0 : (N, 3) array_like
         Sequence of secondary source positions.
@@ -634,14 +648,16 @@ def plane_3d_delay(omega, x0, n0, n=[0, 1, 0], *, c=None):
 
     Returns
     -------
-    d : (N,) numpy.ndarray
+    d : (N,) or (F, N) numpy.ndarray
         Complex weights of secondary sources.
     selection : (N,) numpy.ndarray
         Boolean array containing ``True`` or ``False`` depending on
         whether the corresponding secondary source is "active" or not.
-    secondary_source_function : callable
+    secondary_source_function : callable or list of callable
         A function that can be used to create the sound field of a
         single secondary source.  See `sfs.fd.synthesize()`.
+        If *omega* is a sequence, this is a list with one function
+        per frequency, matching the rows of *d*.
 
     Notes
     -----
@@ -661,7 +677,7 @@ def plane_3d_delay(omega, x0, n0, n=[0, 1, 0], *, c=None):
     """
     x0 = _util.asarray_of_rows(x0)
     n = _util.normalize_vector(n)
-    k = _util.wavenumber(omega, c)
+    k = _util.wavenumber(_as_frequency_column(omega), c)
     d = _np.exp(-1j * k * _np.inner(n, x0))
     selection = _util.source_selection_plane(n0, n)
     return d, selection, _secondary_source_point(omega, c)
@@ -673,9 +689,14 @@ def soundfigure_3d(omega, x0, n0, figure, npw=[0, 0, 1], *, c=None):
     Based on
     [Helwani et al., The Synthesis of Sound Figures, MSSP, 2013]
 
+    The propagating plane wave components of the spatial spectrum of
+    *figure* are gathered in a ``(K, 3)`` matrix of directions and their
+    driving functions (see `plane_3d()`) are summed up with a matrix
+    product, in chunks of at most ``sfs.default.chunk_size`` elements.
+
     """
-    x0 = _np.asarray(x0)
-    n0 = _np.asarray(n0)
+    x0 = _util.asarray_of_rows(x0)
+    n0 = _util.asarray_of_rows(n0)
     k = _util.wavenumber(omega, c)
     nx, ny = figure.shape
 
@@ -688,21 +709,24 @@ def soundfigure_3d(omega, x0, n0, figure, npw=[0, 0, 1], *, c=None):
     # shift spectrum due to desired plane wave
     figure = _np.roll(figure, int(k*npw[0]), axis=0)
     figure = _np.roll(figure, int(k*npw[1]), axis=1)
-    # search and iterate over propagating plane wave components
-    kxx, kyy = _np.meshgrid(kx, ky, sparse=True)
-    rho = _np.sqrt((kxx) ** 2 + (kyy) ** 2)
-    d = 0
-    for n in range(nx):
-        for m in range(ny):
-            if(rho[n, m] < k):
-                # dispertion relation
-                kz = _np.sqrt(k**2 - rho[n, m]**2)
-                # normal vector of plane wave
-                npw = 1/k * _np.asarray([kx[n], ky[m], kz])
-                npw = npw / _np.linalg.norm(npw)
-                # driving function of plane wave with positive kz
-                d_component, selection, secondary_source = plane_3d(
-                    omega, x0, n0, npw, c=c)
-                d += selection * figure[n, m] * d_component
-
-    return d, _util.source_selection_all(len(d)), secondary_source
+    # search propagating plane wave components
+    kxx, kyy = _np.meshgrid(kx, ky, sparse=True, indexing='ij')
+    rho = _np.sqrt(kxx**2 + kyy**2)
+    n, m = _np.nonzero(rho < k)
+    # dispersion relation
+    kz = _np.sqrt(k**2 - rho[n, m]**2)
+    # normal vectors of plane waves with positive kz
+    directions = _kernels.normalize1d(_np.column_stack([kx[n], ky[m], kz]))
+    amplitudes = figure[n, m]
+
+    d = _np.zeros(len(x0), dtype=complex)
+    step = max(1, _default.chunk_size // len(x0))
+    for i in range(0, len(directions), step):
+        npw = directions[i:i + step]
+        # driving functions of plane waves, see plane_3d()
+        projection = npw @ n0.T
+        selection = projection >= _default.selection_tolerance
+        d += amplitudes[i:i + step] @ (
+            selection * 2j * k * projection * _np.exp(-1j * k * (npw @ x0.T)))
+    return (d, _util.source_selection_all(len(d)),
+            _secondary_source_point(omega, c))
@@ -8,6 +8,14 @@ from . import default as _default
 from . import util as _util
 
 
+def _register_cmap(cmap):
+    """Register a color map, matplotlib.cm.register_cmap() was removed."""
+    if hasattr(_mpl, 'colormaps'):
+        _mpl.colormaps.register(cmap)
+    else:
+        _plt.cm.register_cmap(cmap=cmap)
+
+
 def _register_cmap_clip(name, original_cmap, alpha):
     """Create a color map with "over" and "under" values."""
     from matplotlib.colors import LinearSegmentedColormap
@@ -18,7 +26,7 @@ def _register_cmap_clip(name, original_cmap, alpha):
         cmap = LinearSegmentedColormap.from_list(name, cdata)
     cmap.set_over([alpha * c + 1 - alpha for c in cmap(1.0)[:3]])
     cmap.set_under([alpha * c + 1 - alpha for c in cmap(0.0)[:3]])
-    _plt.cm.register_cmap(cmap=cmap)
+    _register_cmap(cmap)
 
 
 # The 'coolwarm' colormap is based on the paper
@@ -36,7 +44,7 @@ def _register_cmap_transparent(name, color):
              'blue': ((0, blue, blue), (1, blue, blue)),
              'alpha': ((0, 0, 0), (1, 1, 1))}
     cmap = LinearSegmentedColormap(name, cdict)
-    _plt.cm.register_cmap(cmap=cmap)
+    _register_cmap(cmap)
 
 
 _register_cmap_transparent('blacktransparent', 'black')
@@ -169,7 +177,8 @@ def _visible_secondarysources(x0, n0, grid):
 
 def amplitude(p, grid, *, xnorm=None, cmap='coolwarm_clip',
               vmin=-2.0, vmax=2.0, xlabel=None, ylabel=None,
-              colorbar=True, colorbar_kwargs={}, ax=None, **kwargs):
+              colorbar=True, colorbar_kwargs={}, ax=None,
+              x=None, y=None, z=None, **kwargs):
     """Two-dimensional plot of sound field (real part).
 
     Parameters
@@ -204,6 +213,13 @@ def amplitude(p, grid, *, xnorm=None, cmap='coolwarm_clip',
         Coordinates of a point to which the sound field should be
         normalized before plotting.  If not specified, no normalization
         is used.  See `sfs.util.normalize()`.
+    x, y, z : float, optional
+        If one of them is given, the slice of a "full" 3D sound field
+        at (approximately) this coordinate is plotted, using a regular
+        *grid* created with `sfs.util.xyz_grid()`.
+        Only this slice is read from *p*, which can also be an on-disk
+        array like a `numpy.memmap` or an HDF5 dataset.
+        See `sfs.util.slice_field()`.
 
     Returns
     -------
@@ -233,8 +249,8 @@ def amplitude(p, grid, *, xnorm=None, cmap='coolwarm_clip',
     sfs.plot2d.level
 
     """
+    p, grid = _util.slice_field(p, grid, x=x, y=y, z=z)
     p = _np.asarray(p)
-    grid = _util.as_xyz_components(grid)
 
     # normalize sound field wrt xnorm
     if xnorm is not None:
@@ -298,7 +314,7 @@ def amplitude(p, grid, *, xnorm=None, cmap='coolwarm_clip',
 
 
 def level(p, grid, *, xnorm=None, power=False, cmap=None, vmax=3, vmin=-50,
-          **kwargs):
+          x=None, y=None, z=None, **kwargs):
     """Two-dimensional plot of level (dB) of sound field.
 
     Takes the same parameters as `sfs.plot2d.amplitude()`.
@@ -309,6 +325,7 @@ def level(p, grid, *, xnorm=None, power=False, cmap=None, vmax=3, vmin=-50,
         See `sfs.util.db()`.
 
     """
+    p, grid = _util.slice_field(p, grid, x=x, y=y, z=z)
     # normalize before converting to dB!
     if xnorm is not None:
         p = _util.normalize(p, grid, xnorm)
@@ -9,14 +9,21 @@
     nfchoa
 
 """
+from concurrent.futures import Executor as _Executor
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+import os as _os
+
 import numpy as _np
 
 from . import source
+from .. import _lazy_submodules
 from .. import array as _array
+from .. import default as _default
 from .. import util as _util
 
 
-def synthesize(signals, weights, ssd, secondary_source_function, **kwargs):
+def synthesize(signals, weights, ssd, secondary_source_function, *,
+               workers=None, out=None, **kwargs):
     """Compute sound field for an array of secondary sources.
 
     Parameters
@@ -24,7 +31,9 @@ def synthesize(signals, weights, ssd, secondary_source_function, **kwargs):
     signals : (N, C) array_like + float
         Driving signals consisting of audio data (C channels) and a
         sampling rate (in Hertz).
-        A `DelayedSignal` object can also be used.
+        A `DelayedSignal` object can also be used, as well as a
+        `SparseDelayedSignal` (its channel weights are applied in
+        addition to *weights*).
     weights : (C,) array_like
         Additional weights applied during integration, e.g. source
         selection and tapering.
@@ -40,34 +49,89 @@ def synthesize(signals, weights, ssd, secondary_source_function, **kwargs):
                 position, normal_vector, weight, driving_signal,
                 **kwargs) -> numpy.ndarray
 
+    workers : int or concurrent.futures.Executor, optional
+        If given, the channels are split into groups whose partial sums
+        are computed in parallel, either by a thread pool with the given
+        number of threads or by the given executor.
+        The partial sums are added up at the end.
+        Since the NumPy kernels release the GIL, threads are sufficient.
+    out : array_like, optional
+        Array which is used to store the result, e.g. a `numpy.memmap`
+        or an HDF5 dataset.  Its shape must be the broadcast shape of
+        *grid*, preceded by the shape of *observation_time* (if any).
+        The sound field is computed and stored in tiles (with at most
+        ``sfs.default.chunk_size`` grid points), see
+        `sfs.util.evaluate_in_chunks()`.
     **kwargs
         All keyword arguments are forwarded to *secondary_source_function*.
         This is typically used to pass the *observation_time* and *grid*
-        arguments.
+        arguments (and optionally a `sfs.util.GeometryCache` as *cache*).
 
     Returns
     -------
-    numpy.ndarray
-        Sound pressure at grid positions.
+    array_like
+        Sound pressure at grid positions (*out*, if given).
+        If the secondary source function is evaluated for multiple
+        observation times (see `sfs.td.source.point()`), the sound
+        fields are stacked along the first axis.
 
     """
+    if out is not None:
+        grid = kwargs.pop('grid')
+        return _util.evaluate_in_chunks(
+            lambda grid: synthesize(signals, weights, ssd,
+                                    secondary_source_function,
+                                    workers=workers, grid=grid, **kwargs),
+            grid, _default.chunk_size, out=out)
     ssd = _array.as_secondary_source_distribution(ssd)
-    data, samplerate, signal_offset = _util.as_delayed_signal(signals)
     weights = _util.asarray_1d(weights)
-    channels = data.T
-    if not (len(ssd.x) == len(ssd.n) == len(ssd.a) == len(channels) ==
+    if isinstance(signals, _util.SparseDelayedSignal):
+        data, samplerate, times, channel_weights = signals
+        weights = weights * channel_weights
+        # Zero padding, for the same interpolation at the signal edges
+        # as with the zeros of a dense multi-channel signal
+        data = _np.pad(data, 1)
+        times = times - 1 / samplerate
+
+        def channel_signal(i):
+            return data, samplerate, times[i]
+        num_channels = len(times)
+    else:
+        data, samplerate, signal_offset = _util.as_delayed_signal(signals)
+        channels = data.T
+
+        def channel_signal(i):
+            return channels[i], samplerate, signal_offset
+        num_channels = len(channels)
+    if not (len(ssd.x) == len(ssd.n) == len(ssd.a) == num_channels ==
             len(weights)):
         raise ValueError("Length mismatch")
-    p = 0
-    for x, n, a, channel, weight in zip(ssd.x, ssd.n, ssd.a,
-                                        channels, weights):
-        if weight != 0:
-            signal = channel, samplerate, signal_offset
-            p += a * weight * secondary_source_function(x, n, signal, **kwargs)
-    return p
-
-
-def apply_delays(signal, delays):
+    active = _np.flatnonzero(weights != 0)
+    if kwargs.get('cache') is not None and 'grid' in kwargs:
+        # Hash the grid once, instead of once per secondary source
+        kwargs['cache'] = kwargs['cache'].bind(kwargs['grid'])
+
+    def partial_sum(indices):
+        p = 0
+        for i in indices:
+            field = _np.asarray(secondary_source_function(
+                ssd.x[i], ssd.n[i], channel_signal(i), **kwargs))
+            # Don't promote single precision fields to double precision
+            coeff = _np.asarray(ssd.a[i] * weights[i]).astype(
+                _np.promote_types(field.dtype, _np.float32))
+            p += coeff * field
+        return p
+
+    if workers is None:
+        return partial_sum(active)
+    if isinstance(workers, _Executor):
+        groups = _np.array_split(active, _os.cpu_count() or 1)
+        return sum(workers.map(partial_sum, groups))
+    with _ThreadPoolExecutor(workers) as executor:
+        return sum(executor.map(partial_sum, _np.array_split(active, workers)))
+
+
+def apply_delays(signal, delays, *, sparse=False):
     """Apply delays for every channel.
 
     Parameters
@@ -77,37 +141,42 @@ def apply_delays(signal, delays):
         rate (in Hertz).  A `DelayedSignal` object can also be used.
     delays : (C,) array_like
         Delay in seconds for each channel (C), negative values allowed.
+    sparse : bool, optional
+        If ``True``, the audio data is not copied for each channel,
+        instead a `SparseDelayedSignal` holding the (shared) audio data
+        and the start time of each channel is returned.
 
     Returns
     -------
-    `DelayedSignal`
+    `DelayedSignal` or `SparseDelayedSignal`
         A tuple containing the delayed signals (in a `numpy.ndarray`
         with shape ``(N, C)``), followed by the sampling rate (in Hertz)
         and a (possibly negative) time offset (in seconds).
+        If *sparse* is ``True``, see `SparseDelayedSignal`.
 
     """
     data, samplerate, initial_offset = _util.as_delayed_signal(signal)
     data = _util.asarray_1d(data)
     delays = _util.asarray_1d(delays)
-    delays += initial_offset
-
-    delays_samples = _np.rint(samplerate * delays).astype(int)
-    offset_samples = delays_samples.min()
-    delays_samples -= offset_samples
-    out = _np.zeros((delays_samples.max() + len(data), len(delays_samples)))
-    for column, row in enumerate(delays_samples):
-        out[row:row + len(data), column] = data
-    return _util.DelayedSignal(out, samplerate, offset_samples / samplerate)
+    signals = _util.SparseDelayedSignal(
+        data, samplerate, delays + initial_offset, _np.ones(len(delays)))
+    return signals if sparse else signals.todense()
 
 
 def secondary_source_point(c):
-    """Create a point source for use in `sfs.td.synthesize()`."""
+    """Create a point source for use in `sfs.td.synthesize()`.
+
+    The returned function accepts an optional *cache* argument,
+    see `sfs.td.source.point()`.
+
+    """
 
-    def secondary_source(position, _, signal, observation_time, grid):
-        return source.point(position, signal, observation_time, grid, c=c)
+    def secondary_source(position, _, signal, observation_time, grid,
+                         cache=None):
+        return source.point(position, signal, observation_time, grid, c=c,
+                            cache=cache)
 
     return secondary_source
 
 
-from . import nfchoa
-from . import wfs
+_lazy_submodules(globals(), ['nfchoa', 'wfs'])
@@ -475,11 +475,8 @@ def driving_signals_25d(delay, weight, sos, phaseshift, signal):
 
     """
     data, fs, t_offset = _util.as_delayed_signal(signal)
-    N = len(phaseshift)
-    out = _np.tile(_np.expand_dims(_sig.sosfilt(sos[0], data), 1), (1, N))
-    for m in range(1, len(sos)):
-        modal_response = _sig.sosfilt(sos[m], data)[:, _np.newaxis]
-        out += modal_response * _np.cos(m * phaseshift)
+    mixing_matrix = _mixing_matrix_25d(len(sos), phaseshift)
+    out = _modal_responses(sos, data) @ mixing_matrix
     return _util.DelayedSignal(2 * weight * out, fs, t_offset + delay)
 
 
@@ -509,9 +506,136 @@ def driving_signals_3d(delay, weight, sos, phaseshift, signal):
 
     """
     data, fs, t_offset = _util.as_delayed_signal(signal)
-    N = len(phaseshift)
-    out = _np.tile(_np.expand_dims(_sig.sosfilt(sos[0], data), 1), (1, N))
-    for m in range(1, len(sos)):
-        modal_response = _sig.sosfilt(sos[m], data)[:, _np.newaxis]
-        out += (2 * m + 1) * modal_response * _legendre(m, _np.cos(phaseshift))
+    mixing_matrix = _mixing_matrix_3d(len(sos), phaseshift)
+    out = _modal_responses(sos, data) @ mixing_matrix
     return _util.DelayedSignal(weight / 4 / _np.pi * out, fs, t_offset + delay)
+
+
+def _modal_responses(sos, data):
+    """Apply all modal filters, return an array with shape (L, M)."""
+    out = _np.empty((len(data), len(sos)))
+    for m, sos_m in enumerate(sos):
+        out[:, m] = _sig.sosfilt(sos_m, data)
+    return out
+
+
+def _mixing_matrix_25d(M, phaseshift):
+    """Mode-to-channel weights for 2.5D NFC-HOA, shape (M, N)."""
+    return _np.cos(_np.outer(_np.arange(M), phaseshift))
+
+
+def _mixing_matrix_3d(M, phaseshift):
+    """Mode-to-channel weights for 3D NFC-HOA, shape (M, N)."""
+    m = _np.arange(M)[:, _np.newaxis]
+    return (2 * m + 1) * _legendre(m, _np.cos(phaseshift))
+
+
+class BlockProcessor25d:
+    """Block-wise computation of 2.5-dimensional NFC-HOA driving signals.
+
+    This is the streaming counterpart of `driving_signals_25d()`:
+    the (mono) input signal is given block by block and the states of the
+    modal filters are carried over between blocks.
+    The arrays holding the modal signals and the driving signals are
+    allocated once and re-used for every block, but
+    :func:`scipy.signal.sosfilt` still returns new arrays (signal and
+    filter state) for each mode and block.
+
+    Parameters
+    ----------
+    delay : float
+        Overall delay in seconds.
+        It is *not* applied by `process()`, it is only stored as
+        attribute `delay`.
+    weight : float
+        Overall weight.
+    sos : list of array_like
+        Second-order section filters :func:`scipy.signal.sosfilt`.
+    phaseshift : (N,) array_like
+        Phase shift in radians.
+    blocksize : int
+        Maximum number of samples per block.
+
+    Examples
+    --------
+    ::
+
+        delay, weight, sos, phaseshift, selection, secondary_source = \\
+            sfs.td.nfchoa.plane_25d(array.x, R, npw, fs)
+        processor = sfs.td.nfchoa.BlockProcessor25d(
+            delay, weight, sos, phaseshift, blocksize=256)
+        for block in blocks:
+            d = processor.process(block)  # shape (256, N)
+
+    """
+
+    def __init__(self, delay, weight, sos, phaseshift, blocksize):
+        phaseshift = _util.asarray_1d(phaseshift)
+        self._setup(delay, sos, blocksize,
+                    2 * weight * _mixing_matrix_25d(len(sos), phaseshift))
+
+    def _setup(self, delay, sos, blocksize, mixing_matrix):
+        self.delay = delay
+        self.blocksize = blocksize
+        self._sos = [_np.asarray(sos_m) for sos_m in sos]
+        self._mixing_matrix = mixing_matrix
+        self._modes = _np.zeros((blocksize, len(sos)))
+        self._out = _np.zeros((blocksize, mixing_matrix.shape[1]))
+        self.reset()
+
+    def reset(self):
+        """Reset the states of all filters to zero."""
+        self._zi = [_np.zeros((len(sos_m), 2)) for sos_m in self._sos]
+
+    def process(self, block):
+        """Compute driving signals for the next block of the input signal.
+
+        Parameters
+        ----------
+        block : (L,) array_like
+            Audio data with at most *blocksize* samples.
+
+        Returns
+        -------
+        (L, N) numpy.ndarray
+            Driving signals.  The array is re-used (and overwritten)
+            by the next call to `process()`.
+
+        """
+        block = _util.asarray_1d(block)
+        L = len(block)
+        if L > self.blocksize:
+            raise ValueError("block is larger than blocksize")
+        for m, sos_m in enumerate(self._sos):
+            self._modes[:L, m], self._zi[m] = _sig.sosfilt(
+                sos_m, block, zi=self._zi[m])
+        return _np.matmul(self._modes[:L], self._mixing_matrix,
+                          out=self._out[:L])
+
+
+class BlockProcessor3d(BlockProcessor25d):
+    """Block-wise computation of 3-dimensional NFC-HOA driving signals.
+
+    This is the streaming counterpart of `driving_signals_3d()`,
+    see `BlockProcessor25d` for details.
+
+    Parameters
+    ----------
+    delay : float
+        Overall delay in seconds.
+    weight : float
+        Overall weight.
+    sos : list of array_like
+        Second-order section filters :func:`scipy.signal.sosfilt`.
+    phaseshift : (N,) array_like
+        Phase shift in radians.
+    blocksize : int
+        Maximum number of samples per block.
+
+    """
+
+    def __init__(self, delay, weight, sos, phaseshift, blocksize):
+        phaseshift = _util.asarray_1d(phaseshift)
+        mixing_matrix = weight / 4 / _np.pi * _mixing_matrix_3d(len(sos),
+                                                                phaseshift)
+        self._setup(delay, sos, blocksize, mixing_matrix)
@@ -25,11 +25,13 @@ The Green's function describes the spatial sound propagation over time.
 """
 import numpy as _np
 
+from .. import _kernels
 from .. import default as _default
 from .. import util as _util
 
 
-def point(xs, signal, observation_time, grid, c=None):
+def point(xs, signal, observation_time, grid, c=None, cache=None, *,
+          dtype=None):
     r"""Source model for a point source: 3D Green's function.
 
     Calculates the scalar sound pressure field for a given point in
@@ -42,19 +44,26 @@ def point(xs, signal, observation_time, grid, c=None):
     signal : (N,) array_like + float
         Excitation signal consisting of (mono) audio data and a sampling
         rate (in Hertz).  A `DelayedSignal` object can also be used.
-    observation_time : float
-        Observed point in time.
+    observation_time : float or (T,) array_like
+        Observed point in time.  If T points in time are given, the
+        sound fields are stacked along a new first axis.
     grid : triple of array_like
         The grid that is used for the sound field calculations.
         See `sfs.util.xyz_grid()`.
     c : float, optional
         Speed of sound.
+    cache : `sfs.util.GeometryCache`, optional
+        If given, the distance-dependent weights and delays are taken
+        from (or stored in) this cache.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
 
     Returns
     -------
     numpy.ndarray
         Scalar sound pressure field, evaluated at positions given by
-        *grid*.
+        *grid* (and at all given observation times).
 
     Notes
     -----
@@ -72,28 +81,38 @@ def point(xs, signal, observation_time, grid, c=None):
         sfs.plot2d.level(p, grid)
 
     """
-    xs = _util.asarray_1d(xs)
+    return _point(_util.asarray_1d(xs), signal, observation_time, grid, c,
+                  cache, dtype)
+
+
+def _point(xs, signal, observation_time, grid, c, cache, dtype=None):
+    """Point source(s), several sources (rows of *xs*) are stacked."""
     data, samplerate, signal_offset = _util.as_delayed_signal(signal)
     data = _util.asarray_1d(data)
-    grid = _util.as_xyz_components(grid)
     if c is None:
         c = _default.c
-    r = _np.linalg.norm(grid - xs)
-    # If r is +-0, the sound pressure is +-infinity
-    with _np.errstate(divide='ignore'):
-        weights = 1 / (4 * _np.pi * r)
-    delays = r / c
-    base_time = observation_time - signal_offset
+    dtype = _util.real_dtype(dtype)
+    if cache is None:
+        weights, delays = _point_geometry(xs, grid, c, dtype)
+    else:
+        weights, delays = cache.get(
+            ('point', xs.shape, xs.tobytes(), c, dtype.str), grid,
+            lambda: _point_geometry(xs, grid, c, dtype))
+    base_time = _np.asarray(observation_time) - signal_offset
+    # Stack multiple observation times along a new first axis
+    base_time = base_time.reshape(base_time.shape + (1,) * _np.ndim(delays))
     points_at_time = _np.interp(base_time - delays,
                                _np.arange(len(data)) / samplerate,
                                data, left=0, right=0)
+    points_at_time = points_at_time.astype(dtype, copy=False)
     # weights can be +-infinity
     with _np.errstate(invalid='ignore'):
         return weights * points_at_time
 
 
 def point_image_sources(x0, signal, observation_time, grid, L, max_order,
-                        coeffs=None, c=None):
+                        coeffs=None, c=None, cache=None, *,
+                        max_distance=None, threshold=None, dtype=None):
     """Point source in a rectangular room using the mirror image source model.
 
     Parameters
@@ -103,8 +122,9 @@ def point_image_sources(x0, signal, observation_time, grid, L, max_order,
     signal : (N,) array_like + float
         Excitation signal consisting of (mono) audio data and a sampling
         rate (in Hertz).  A `DelayedSignal` object can also be used.
-    observation_time : float
-        Observed point in time.
+    observation_time : float or (T,) array_like
+        Observed point in time.  If T points in time are given, the
+        sound fields are stacked along a new first axis.
     grid : triple of array_like
         The grid that is used for the sound field calculations.
         See `sfs.util.xyz_grid()`.
@@ -117,12 +137,20 @@ def point_image_sources(x0, signal, observation_time, grid, L, max_order,
         If not given, the reflection coefficients are set to one.
     c : float, optional
         Speed of sound.
+    cache : `sfs.util.GeometryCache`, optional
+        Cache for the geometry of the image sources, see `point()`.
+    max_distance, threshold : float, optional
+        Discard image sources that are far away from the room or that
+        are weak, see `sfs.util.select_image_sources()`.
+    dtype : data-type, optional
+        Floating point type of the computation, e.g. ``'float32'``.
+        Default: ``sfs.default.dtype``, see `sfs.util.real_dtype()`.
 
     Returns
     -------
     numpy.ndarray
         Scalar sound pressure field, evaluated at positions given by
-        *grid*.
+        *grid* (and at all given observation times).
 
     Examples
     --------
@@ -138,15 +166,137 @@ def point_image_sources(x0, signal, observation_time, grid, L, max_order,
         sfs.plot2d.level(p, grid)
 
     """
-    if coeffs is None:
-        coeffs = _np.ones(6)
-
     positions, order = _util.image_sources_for_box(x0, L, max_order)
-    source_strengths = _np.prod(coeffs**order, axis=1)
+    positions, strengths = _util.select_image_sources(
+        positions, order, L, coeffs=coeffs, max_distance=max_distance,
+        threshold=threshold)
+    dtype = _util.real_dtype(dtype)
+    strengths = strengths.astype(dtype)
 
+    # All image sources of a chunk are evaluated at once
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+    if cache is not None:
+        cache = cache.bind(grid)
+    time_axes = _np.ndim(observation_time)
+    step = max(1, _default.chunk_size // (_np.broadcast(*grid).size *
+                                          _np.size(observation_time)))
     p = 0
-    for position, strength in zip(positions, source_strengths):
-        if strength != 0:
-            p += strength * point(position, signal, observation_time, grid, c)
-
+    for i in range(0, len(positions), step):
+        p += _np.tensordot(
+            strengths[i:i + step],
+            _point(positions[i:i + step], signal, observation_time, grid, c,
+                   cache, dtype),
+            axes=(0, time_axes))
     return p
+
+
+def room_impulse_responses(x0, receivers, L, max_order, samplerate, *,
+                           coeffs=None, c=None, length=None, order=3,
+                           max_distance=None, threshold=None):
+    """Impulse responses of a rectangular room at given receiver positions.
+
+    Like `point_image_sources()`, the mirror image source model is used,
+    but instead of evaluating sound fields on a grid, the impulse
+    responses between the source(s) and a list of receivers are
+    rendered directly.  The delays are not rounded to integer samples,
+    they are realized by Lagrange interpolation, see
+    `sfs.util.lagrange_fractional_delay()`.
+
+    Parameters
+    ----------
+    x0 : (3,) or (S, 3) array_like
+        Position(s) of source(s), e.g. the loudspeakers of an array.
+    receivers : (R, 3) array_like
+        Receiver positions.
+    L : (3,) array_like
+        Dimensions of the rectangular room.
+    max_order : int
+        Maximum number of reflections for each image source.
+    samplerate : float
+        Sampling rate in Hertz.
+    coeffs : (6,) array_like, optional
+        Reflection coeffecients of the walls.
+        If not given, the reflection coefficients are set to one.
+    c : float, optional
+        Speed of sound.
+    length : int, optional
+        Length of the impulse responses in samples.  By default, it is
+        long enough for all (selected) image sources.
+    order : int, optional
+        Order of the Lagrange interpolation.
+    max_distance, threshold : float, optional
+        Discard image sources that are far away from the room or that
+        are weak, see `sfs.util.select_image_sources()`.
+
+    Returns
+    -------
+    `DelayedSignal`
+        Impulse responses (in a `numpy.ndarray` with shape ``(N, R)``,
+        or ``(N, S, R)`` for multiple sources), followed by the
+        sampling rate (in Hertz) and a time offset of 0.
+
+    Examples
+    --------
+    ::
+
+        room = 5, 3, 1.5
+        receivers = [[1, 1, 0.7], [3, 2, 0.7]]
+        h = sfs.td.source.room_impulse_responses(
+            xs, receivers, room, 10, fs, coeffs=[0.8] * 6)
+        # shape of h.data: (length, 2)
+
+    """
+    x0 = _np.asarray(x0, dtype=float)
+    receivers = _util.asarray_of_rows(receivers)
+    if c is None:
+        c = _default.c
+    taps = _np.arange(order + 1)
+    responses = []
+    for source in _np.atleast_2d(x0):
+        positions, wall_count = _util.image_sources_for_box(source, L,
+                                                            max_order)
+        positions, strengths = _util.select_image_sources(
+            positions, wall_count, L, coeffs=coeffs,
+            max_distance=max_distance, threshold=threshold)
+        # Shape (M, R) for M image sources and R receivers:
+        r = _kernels.norm1d(positions[:, _np.newaxis] - receivers)
+        offsets, h = _util.lagrange_fractional_delay(r / c * samplerate,
+                                                     order)
+        with _np.errstate(divide='ignore'):
+            values = strengths[:, _np.newaxis, _np.newaxis] * h / (
+                4 * _np.pi * r[..., _np.newaxis])
+        responses.append((offsets[..., _np.newaxis] + taps, values))
+    if length is None:
+        length = max((samples.max() + 1 for samples, _ in responses
+                      if samples.size), default=0)
+    R = len(receivers)
+    receiver_index = _np.arange(R)[:, _np.newaxis]
+    data = _np.empty((len(responses), R, length))
+    for out, (samples, values) in zip(data, responses):
+        valid = (samples >= 0) & (samples < length)
+        index = (receiver_index * length + samples)[valid]
+        out.flat = _np.bincount(index, weights=values[valid],
+                                minlength=R * length)
+    data = _np.moveaxis(data, -1, 0)
+    if x0.ndim == 1:
+        data = data[:, 0]
+    return _util.DelayedSignal(data, samplerate, 0)
+
+
+def _point_geometry(xs, grid, c, dtype=None):
+    """Distance-dependent weights and delays of a point source."""
+    dtype = _util.real_dtype(dtype)
+    xs = xs.astype(dtype)
+    c = dtype.type(c)
+    grid = _util.as_xyz_components(grid, dtype=dtype)
+    if xs.ndim == 2:
+        # Several sources, stacked along a new first axis
+        xs = xs.reshape(xs.shape + (1,) * _np.broadcast(*grid).ndim)
+        r = _np.sqrt(sum((g - x)**2 for g, x in zip(grid, xs.swapaxes(0, 1))))
+    else:
+        r = _np.linalg.norm(grid - xs)
+    # If r is +-0, the sound pressure is +-infinity
+    with _np.errstate(divide='ignore'):
+        weights = 1 / (4 * _np.pi * r)
+    delays = r / c
+    return weights, delays
@@ -43,10 +43,10 @@
 
 """
 import numpy as _np
-from numpy.core.umath_tests import inner1d as _inner1d
 
 from . import apply_delays as _apply_delays
 from . import secondary_source_point as _secondary_source_point
+from .. import _kernels
 from .. import default as _default
 from .. import util as _util
 
@@ -117,9 +117,9 @@ def plane_25d(x0, n0, n=[0, 1, 0], xref=[0, 0, 0], c=None):
     n0 = _util.asarray_of_rows(n0)
     n = _util.normalize_vector(n)
     xref = _util.asarray_1d(xref)
-    g0 = _np.sqrt(2 * _np.pi * _np.linalg.norm(xref - x0, axis=1))
-    delays = _inner1d(n, x0) / c
-    weights = 2 * g0 * _inner1d(n, n0)
+    g0 = _np.sqrt(2 * _np.pi * _kernels.norm1d(xref - x0))
+    delays = _kernels.inner1d(n, x0) / c
+    weights = 2 * g0 * _kernels.inner1d(n, n0)
     selection = _util.source_selection_plane(n0, n)
     return delays, weights, selection, _secondary_source_point(c)
 
@@ -192,11 +192,11 @@ def point_25d(x0, n0, xs, xref=[0, 0, 0], c=None):
     n0 = _util.asarray_of_rows(n0)
     xs = _util.asarray_1d(xs)
     xref = _util.asarray_1d(xref)
-    g0 = _np.sqrt(2 * _np.pi * _np.linalg.norm(xref - x0, axis=1))
+    g0 = _np.sqrt(2 * _np.pi * _kernels.norm1d(xref - x0))
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
+    r = _kernels.norm1d(ds)
     delays = r/c
-    weights = g0 * _inner1d(ds, n0) / (2 * _np.pi * r**(3/2))
+    weights = g0 * _kernels.inner1d(ds, n0) / (2 * _np.pi * r**(3/2))
     selection = _util.source_selection_point(n0, x0, xs)
     return delays, weights, selection, _secondary_source_point(c)
 
@@ -275,16 +275,16 @@ def focused_25d(x0, n0, xs, ns, xref=[0, 0, 0], c=None):
     xs = _util.asarray_1d(xs)
     xref = _util.asarray_1d(xref)
     ds = x0 - xs
-    r = _np.linalg.norm(ds, axis=1)
-    g0 = _np.sqrt(_np.linalg.norm(xref - x0, axis=1)
-                  / (_np.linalg.norm(xref - x0, axis=1) + r))
+    r = _kernels.norm1d(ds)
+    g0 = _np.sqrt(_kernels.norm1d(xref - x0)
+                  / (_kernels.norm1d(xref - x0) + r))
     delays = -r/c
-    weights = g0 * _inner1d(ds, n0) / (2 * _np.pi * r**(3/2))
+    weights = g0 * _kernels.inner1d(ds, n0) / (2 * _np.pi * r**(3/2))
     selection = _util.source_selection_focused(ns, x0, xs)
     return delays, weights, selection, _secondary_source_point(c)
 
 
-def driving_signals(delays, weights, signal):
+def driving_signals(delays, weights, signal, *, sparse=False):
     """Get driving signals per secondary source.
 
     Returned signals are the delayed and weighted mono input signal
@@ -299,16 +299,178 @@ def driving_signals(delays, weights, signal):
     signal : (N,) array_like + float
         Excitation signal consisting of (mono) audio data and a sampling
         rate (in Hertz).  A `DelayedSignal` object can also be used.
+    sparse : bool, optional
+        If ``True``, the audio data is not copied for each channel,
+        see `sfs.td.apply_delays()`.
 
     Returns
     -------
-    `DelayedSignal`
+    `DelayedSignal` or `SparseDelayedSignal`
         A tuple containing the driving signals (in a `numpy.ndarray`
         with shape ``(N, C)``), followed by the sampling rate (in Hertz)
         and a (possibly negative) time offset (in seconds).
+        If *sparse* is ``True``, see `SparseDelayedSignal`.
 
     """
     delays = _util.asarray_1d(delays)
     weights = _util.asarray_1d(weights)
+    if sparse:
+        data, samplerate, times, _ = _apply_delays(signal, delays,
+                                                   sparse=True)
+        return _util.SparseDelayedSignal(data, samplerate, times, weights)
     data, samplerate, signal_offset = _apply_delays(signal, delays)
     return _util.DelayedSignal(data * weights, samplerate, signal_offset)
+
+
+class BlockRenderer:
+    """Block-wise WFS rendering with fractional delays.
+
+    This is the streaming counterpart of `driving_signals()`.
+    The (mono) input signal is given block by block, its history is kept
+    in a buffer and the delays are realized by Lagrange interpolation,
+    i.e. they are not rounded to integer samples.
+    Delays and weights can be changed between blocks (e.g. for moving
+    sources), see `set_delays()`.
+
+    Parameters
+    ----------
+    delays : (C,) array_like
+        Delay in seconds for each channel, negative values allowed.
+    weights : (C,) array_like
+        Amplitude weighting factor for each channel.
+    samplerate : float
+        Sampling rate in Hertz.
+    blocksize : int
+        Number of samples per block.
+    order : int, optional
+        Order of the Lagrange interpolation.
+    pre_delay : float, optional
+        Additional delay (in seconds) applied to all channels.
+        Because future input samples are not available,
+        ``delays + pre_delay`` must not be negative (actually, it must
+        be at least ``(order - 1) / 2`` samples).
+        By default, the smallest possible value for *delays* is used.
+    max_delay : float, optional
+        Largest delay (in seconds, without *pre_delay*) that will be
+        used, this determines the size of the history buffer.
+        By default, the largest value of *delays* is used.
+
+    Attributes
+    ----------
+    pre_delay : float
+        See above.  The output of `process()` has a time offset of
+        ``-pre_delay`` (in the sense of `sfs.util.DelayedSignal`).
+
+    Examples
+    --------
+    ::
+
+        delays, weights, selection, secondary_source = \\
+            sfs.td.wfs.point_25d(array.x, array.n, xs)
+        renderer = sfs.td.wfs.BlockRenderer(
+            delays, weights * selection, fs, blocksize=256)
+        for block in blocks:
+            d = renderer.process(block)  # shape (256, C)
+
+    """
+
+    def __init__(self, delays, weights, samplerate, blocksize, *,
+                 order=3, pre_delay=None, max_delay=None):
+        delays = _util.asarray_1d(delays)
+        if pre_delay is None:
+            pre_delay = (max(0, -delays.min())
+                         + _np.ceil((order - 1) / 2) / samplerate)
+        if max_delay is None:
+            max_delay = delays.max()
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.order = order
+        self.pre_delay = pre_delay
+        history = (int(_np.ceil((max_delay + pre_delay) * samplerate))
+                   + order + 1)
+        self._buffer = _np.zeros(history + blocksize)
+        self._out = _np.zeros((blocksize, len(delays)))
+        self._gather = _np.zeros((order + 1, blocksize, len(delays)))
+        self._target = None
+        self._set(self._delay_samples(delays), _util.asarray_1d(weights))
+
+    def _delay_samples(self, delays):
+        delays = (_util.asarray_1d(delays) + self.pre_delay) * self.samplerate
+        history = len(self._buffer) - self.blocksize
+        low, high = (self.order - 1) / 2, history - self.order - 1
+        tolerance = 1e-9  # rounding errors from conversion to samples
+        if delays.min() < low - tolerance or delays.max() > high + tolerance:
+            raise ValueError("delays out of range (check pre_delay and "
+                             "max_delay)")
+        return _np.clip(delays, low, high)
+
+    def _indices(self, offsets):
+        history = len(self._buffer) - self.blocksize
+        n = history + _np.arange(self.blocksize)[:, _np.newaxis] - offsets
+        return n - _np.arange(self.order + 1)[:, _np.newaxis, _np.newaxis]
+
+    def _set(self, delays, weights):
+        self._delays = delays
+        self._weights = weights
+        offsets, h = _util.lagrange_fractional_delay(delays, self.order)
+        self._indices_static = self._indices(offsets)
+        self._coefficients = (h * weights[:, _np.newaxis]).T[:, _np.newaxis]
+
+    def set_delays(self, delays, weights=None):
+        """Set new delays (and weights) for the following blocks.
+
+        During the next call to `process()`, delays and weights are
+        linearly interpolated from their old to their new values.
+
+        Parameters
+        ----------
+        delays : (C,) array_like
+            Delay in seconds for each channel.
+        weights : (C,) array_like, optional
+            Amplitude weighting factor for each channel.
+            If not given, the weights are not changed.
+
+        """
+        delays = self._delay_samples(delays)
+        if weights is None:
+            weights = self._weights
+        self._target = delays, _util.asarray_1d(weights)
+
+    def process(self, block):
+        """Compute driving signals for the next block of the input signal.
+
+        Parameters
+        ----------
+        block : (blocksize,) array_like
+            Audio data.
+
+        Returns
+        -------
+        (blocksize, C) numpy.ndarray
+            Driving signals.  The array is re-used (and overwritten)
+            by the next call to `process()`.
+
+        """
+        block = _util.asarray_1d(block)
+        if len(block) != self.blocksize:
+            raise ValueError("block must have blocksize samples")
+        buffer = self._buffer
+        buffer[:-self.blocksize] = buffer[self.blocksize:]
+        buffer[-self.blocksize:] = block
+        if self._target is None:
+            _np.take(buffer, self._indices_static, out=self._gather)
+            _np.multiply(self._gather, self._coefficients, out=self._gather)
+            return self._gather.sum(axis=0, out=self._out)
+        delays, weights = self._target
+        ramp = (_np.arange(1, self.blocksize + 1)
+                / self.blocksize)[:, _np.newaxis]
+        ramped_delays = self._delays + (delays - self._delays) * ramp
+        ramped_weights = self._weights + (weights - self._weights) * ramp
+        offsets, h = _util.lagrange_fractional_delay(ramped_delays,
+                                                     self.order)
+        h *= ramped_weights[..., _np.newaxis]
+        samples = buffer[self._indices(offsets)]
+        _np.einsum('kbc,bck->bc', samples, h, out=self._out)
+        self._set(delays, weights)
+        self._target = None
+        return self._out
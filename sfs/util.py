@@ -5,10 +5,13 @@
 """
 
 import collections
+import hashlib
+import itertools
+import threading
 import numpy as np
-from numpy.core.umath_tests import inner1d
-from scipy.special import spherical_jn, spherical_yn
+from scipy.special import hankel2, jv, spherical_jn, spherical_yn
 from . import default
+from . import _kernels
 
 
 def rotation_matrix(n1, n2):
@@ -51,6 +54,36 @@ def wavenumber(omega, c=None):
     return omega / c
 
 
+def real_dtype(dtype=None):
+    """Return the real floating point type used for computations.
+
+    Parameters
+    ----------
+    dtype : data-type, optional
+        Requested type, e.g. ``'float32'``.  A complex type selects the
+        corresponding real type.  Default: ``sfs.default.dtype``.
+
+    Returns
+    -------
+    numpy.dtype
+        ``float32`` or ``float64``.
+
+    """
+    if dtype is None:
+        dtype = default.dtype
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'c':
+        dtype = np.finfo(dtype).dtype
+    if dtype.kind != 'f':
+        raise ValueError("dtype must be a floating point type")
+    return dtype
+
+
+def complex_dtype(dtype=None):
+    """Return the complex type corresponding to `real_dtype()`."""
+    return np.result_type(real_dtype(dtype), np.complex64)
+
+
 def direction_vector(alpha, beta=np.pi/2):
     """Compute normal vector from azimuth, colatitude."""
     return sph2cart(alpha, beta, 1)
@@ -314,6 +347,141 @@ def xyz_grid(x, y, z, *, spacing, endpoint=True, **kwargs):
     return XyzComponents(grid)
 
 
+def grid_chunks(grid, chunk_points):
+    """Split a grid into chunks with a limited number of points.
+
+    The grid is split along its leading (broadcast) dimensions, the
+    components of each chunk keep the sparse structure of *grid*.
+
+    Parameters
+    ----------
+    grid : triple or pair of array_like
+        A grid, e.g. created with `xyz_grid()`, or a point cloud.
+    chunk_points : int
+        Maximum number of grid points per chunk.  If a single row along
+        the last dimension has more points, the rows are split as well,
+        into chunks of (at most) *chunk_points* points.
+
+    Yields
+    ------
+    index : tuple of slice
+        Location of the chunk within the broadcast shape of *grid*.
+    chunk : `XyzComponents`
+        The grid components of the chunk.
+
+    See Also
+    --------
+    evaluate_in_chunks
+
+    """
+    grid = as_xyz_components(grid)
+    shape = np.broadcast(*grid).shape
+    if not shape:
+        yield (), grid
+        return
+    components = [c.reshape((1,) * (len(shape) - c.ndim) + c.shape)
+                  for c in grid]
+    axis = 0
+    while axis < len(shape) - 1 and np.prod(shape[axis + 1:]) > chunk_points:
+        axis += 1
+    step = max(1, chunk_points // int(np.prod(shape[axis + 1:])))
+    ranges = [range(n) for n in shape[:axis]]
+    ranges.append(range(0, shape[axis], step))
+    for starts in itertools.product(*ranges):
+        index = tuple(slice(i, i + 1) for i in starts[:-1])
+        index += slice(starts[-1], starts[-1] + step),
+        yield index, XyzComponents([
+            c[tuple(i if n > 1 else slice(None)
+                    for i, n in zip(index, c.shape))]
+            for c in components])
+
+
+def evaluate_in_chunks(func, grid, chunk_points, *, out=None):
+    """Evaluate a sound field chunk by chunk.
+
+    Peak memory usage is proportional to the size of the chunks, except
+    for the output array, which is allocated only once.
+
+    Parameters
+    ----------
+    func : callable
+        A function that takes a grid and returns a `numpy.ndarray` with
+        the broadcast shape of this grid, optionally preceded by further
+        axes (e.g. for multiple observation times).
+    grid : triple or pair of array_like
+        The grid that is used for the sound field calculations.
+        See `xyz_grid()`.
+    chunk_points : int
+        Maximum number of grid points per chunk, see `grid_chunks()`.
+    out : array_like, optional
+        Array with the shape of the whole result which is used to store
+        it, e.g. a `numpy.memmap` or an HDF5 dataset (anything that
+        supports assignment to slices).  If not given, a new
+        `numpy.ndarray` is created.
+
+    Returns
+    -------
+    array_like
+        Result of *func* for the whole *grid*.
+
+    """
+    grid = as_xyz_components(grid)
+    shape = np.broadcast(*grid).shape
+    for index, chunk in grid_chunks(grid, chunk_points):
+        result = np.asarray(func(chunk))
+        leading = (slice(None),) * (result.ndim - len(shape))
+        if out is None:
+            out = np.empty(result.shape[:len(leading)] + shape,
+                           dtype=result.dtype)
+        out[leading + index] = result
+    return out
+
+
+def slice_field(p, grid, *, x=None, y=None, z=None):
+    """Read a slice with a singleton dimension from a 3D sound field.
+
+    Parameters
+    ----------
+    p : array_like
+        Sound field with three dimensions, e.g. a `numpy.memmap` or an
+        HDF5 dataset.  Only the slice is read from it.
+    grid : triple of array_like
+        The regular 3D grid that was used to calculate *p*,
+        see `xyz_grid()`.
+    x, y, z : float, optional
+        At most one of them can be given, the slice at (approximately)
+        this coordinate is returned.  If none is given, *p* and *grid*
+        are returned unchanged.
+
+    Returns
+    -------
+    p : array_like
+        Slice of *p* with a singleton dimension.
+    grid : `XyzComponents`
+        The corresponding slice of *grid*.
+
+    """
+    grid = as_xyz_components(grid)
+    coordinates = [(i, value) for i, value in enumerate([x, y, z])
+                   if value is not None]
+    if not coordinates:
+        return p, grid
+    if len(coordinates) > 1:
+        raise ValueError("Only one of x, y and z can be given")
+    (i, value), = coordinates
+    component = np.asarray(grid[i])
+    if len(p.shape) != 3 or component.ndim != 3:
+        raise ValueError("Slices need a 3D sound field and a 3D grid")
+    axis = np.argmax(component.shape)
+    k = np.argmin(np.abs(component.ravel() - value))
+    index = [slice(None)] * 3
+    index[axis] = slice(k, k + 1)
+    index = tuple(index)
+    grid = XyzComponents([c[index] if np.ndim(c) == 3 and c.shape[axis] > 1
+                          else c for c in grid])
+    return p[index], grid
+
+
 def normalize(p, grid, xnorm):
     """Normalize sound field wrt position *xnorm*."""
     return p / np.abs(probe(p, grid, xnorm))
@@ -355,6 +523,44 @@ def db(x, *, power=False):
         return (10 if power else 20) * np.log10(np.abs(x))
 
 
+def lagrange_fractional_delay(delay, order=3):
+    """Lagrange interpolation filters for fractional delays.
+
+    A delay of *delay* samples is split into an integer offset and
+    an FIR filter with ``order + 1`` coefficients, i.e. the delayed
+    signal is ``y[n] = sum(h[k] * x[n - offset - k] for k in ...)``.
+    The offset is chosen such that the fractional part is centered
+    between the filter taps.
+
+    Parameters
+    ----------
+    delay : array_like
+        Delay(s) in samples.  Values smaller than ``(order - 1) / 2``
+        lead to negative offsets.
+    order : int, optional
+        Order of the Lagrange polynomial.
+
+    Returns
+    -------
+    offset : numpy.ndarray
+        Integer offsets, same shape as *delay*.
+    h : numpy.ndarray
+        Filter coefficients, with an additional last axis of length
+        ``order + 1``.
+
+    """
+    delay = np.asarray(delay, dtype=float)
+    offset = np.floor(delay - (order - 1) / 2).astype(int)
+    d = (delay - offset)[..., np.newaxis]
+    k = np.arange(order + 1)
+    h = np.ones(delay.shape + (order + 1,))
+    for j in range(order + 1):
+        factor = (d - j) / np.where(k == j, 1, k - j)
+        factor[..., j] = 1
+        h *= factor
+    return offset, h
+
+
 class XyzComponents(np.ndarray):
     """See __init__()."""
 
@@ -406,7 +612,7 @@ class XyzComponents(np.ndarray):
             return obj.view(XyzComponents)
         return obj
 
-    def __array_wrap__(self, obj, context=None):
+    def __array_wrap__(self, obj, context=None, return_scalar=False):
         if obj.ndim != 1 or len(obj) not in (2, 3):
             return obj.view(np.ndarray)
         return obj
@@ -467,6 +673,173 @@ If you want to ensure that a given variable contains a valid signal, use
 """
 
 
+class SparseDelayedSignal(collections.namedtuple(
+        'SparseDelayedSignal', 'data samplerate time weights')):
+    """A tuple of shared audio data, sampling rate, start times and weights.
+
+    This is a memory-efficient alternative to a multi-channel
+    `DelayedSignal` where all channels are delayed and weighted copies
+    of the same (mono) audio data.
+    Instead of copying the audio data, only the start time (in seconds)
+    and the weight of each channel are stored (in arrays of shape
+    ``(C,)``).  The start times are not rounded to integer samples.
+
+    This class (a `collections.namedtuple`) is not meant to be instantiated
+    by users, it is returned by `sfs.td.apply_delays()` and
+    `sfs.td.wfs.driving_signals()` when called with ``sparse=True``.
+
+    """
+
+    __slots__ = ()
+
+    def todense(self):
+        """Convert to a multi-channel `DelayedSignal`.
+
+        The start times are rounded to integer samples.
+
+        """
+        delays_samples = np.rint(self.samplerate * self.time).astype(int)
+        offset_samples = delays_samples.min()
+        delays_samples -= offset_samples
+        length = len(self.data)
+        # Channels are contiguous in memory, the result is a transposed view
+        out = np.zeros((len(delays_samples), delays_samples.max() + length),
+                       dtype=np.result_type(self.data, self.weights))
+        for channel, start, weight in zip(out, delays_samples, self.weights):
+            np.multiply(self.data, weight, out=channel[start:start + length])
+        return DelayedSignal(out.T, self.samplerate,
+                             offset_samples / self.samplerate)
+
+
+class GeometryCache:
+    """Cache for geometry-dependent fields, e.g. distances and delays.
+
+    When many sound fields are computed for the same source positions and
+    the same grid (e.g. for different observation times), the
+    distance-dependent parts can be computed once and re-used.
+    The least recently used entries are evicted if the total size of all
+    cached arrays exceeds *max_bytes*.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum total size (in bytes) of all cached arrays.
+
+    Examples
+    --------
+    The cache can be passed to `sfs.td.synthesize()` (and to
+    `sfs.td.source.point()`):
+
+    >>> import sfs
+    >>> cache = sfs.util.GeometryCache(max_bytes=2**28)
+
+    ::
+
+        for t in observation_times:
+            p = sfs.td.synthesize(d, selection, array, secondary_source,
+                                  grid=grid, observation_time=t,
+                                  cache=cache)
+
+    """
+
+    def __init__(self, max_bytes=2**30):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, grid, func, *, grid_key=None):
+        """Get cached arrays, compute them if needed.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies the cached quantity, e.g. source type and
+            position.  The *grid* is added to the key automatically.
+        grid : triple or pair of array_like
+            The grid that is used for the sound field calculations.
+        func : callable
+            Function without arguments that computes a tuple of arrays.
+            It is only called if there is no matching entry in the cache.
+        grid_key : hashable, optional
+            Pre-computed `grid_key()` of *grid*.  If not given, it is
+            computed from the contents of *grid*, see also `bind()`.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The (possibly cached) return value of *func*.
+
+        """
+        if grid_key is None:
+            grid_key = self.grid_key(grid)
+        key = key, grid_key
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        # The lock is not held here, this can run in parallel:
+        value = func()
+        nbytes = sum(np.asarray(v).nbytes for v in value)
+        with self._lock:
+            if nbytes <= self.max_bytes and key not in self._entries:
+                self._entries[key] = value
+                self.nbytes += nbytes
+                while self.nbytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.nbytes -= sum(np.asarray(v).nbytes for v in evicted)
+        return value
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def bind(self, grid):
+        """Return a view of the cache for a fixed grid.
+
+        The `grid_key()` is computed only once, the returned object's
+        ``get()`` method uses it for all entries, regardless of the
+        *grid* passed to it.  The grid must not be changed while the
+        returned object is in use.
+        This is used by `sfs.td.synthesize()`, which evaluates many
+        secondary sources on the same grid.
+
+        """
+        return _BoundGeometryCache(self, self.grid_key(grid))
+
+    @staticmethod
+    def grid_key(grid):
+        """Hashable key computed from the contents of *grid*."""
+        # The grid may have been changed in-place since the last call,
+        # therefore the key is always computed from its contents.
+        return tuple(
+            (c.shape, c.dtype.str,
+             hashlib.blake2b(np.ascontiguousarray(c)).digest())
+            for c in as_xyz_components(grid))
+
+
+class _BoundGeometryCache:
+    """`GeometryCache` with a fixed grid, see `GeometryCache.bind()`."""
+
+    def __init__(self, cache, grid_key):
+        self._cache = cache
+        self._grid_key = grid_key
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key, grid, func):
+        return self._cache.get(key, grid, func, grid_key=self._grid_key)
+
+    def bind(self, grid):
+        return self._cache.bind(grid)
+
+
 def image_sources_for_box(x, L, N, *, prune=True):
     """Image source method for a cuboid room.
 
@@ -531,6 +904,55 @@ def image_sources_for_box(x, L, N, *, prune=True):
     return xs, wall_count
 
 
+def select_image_sources(xs, wall_count, L, *, coeffs=None,
+                         max_distance=None, threshold=None):
+    """Select image sources by their strength and distance to the room.
+
+    Image sources with zero strength are always discarded.  Further
+    image sources can be culled with *max_distance* and *threshold*,
+    which is useful for high orders, see :cite:`Borish1984`.
+
+    Parameters
+    ----------
+    xs : (M, D) array_like
+        Image source positions, see `image_sources_for_box()`.
+    wall_count : (M, 2D) array_like
+        Number of reflections at individual walls for each source,
+        see `image_sources_for_box()`.
+    L : (D,) array_like
+        Side lengths of the room.
+    coeffs : (2D,) array_like, optional
+        Reflection coefficients of the walls.
+        If not given, the reflection coefficients are set to one.
+    max_distance : float, optional
+        Image sources with a larger distance to the room (i.e. to the
+        box between the origin and *L*) are discarded.
+    threshold : float, optional
+        Image sources whose strength (i.e. the absolute value of the
+        product of all reflection coefficients along their path) is
+        smaller are discarded.
+
+    Returns
+    -------
+    xs : (M', D) `numpy.ndarray`
+        Selected image source positions.
+    strengths : (M',) `numpy.ndarray`
+        Their strengths.
+
+    """
+    xs = np.asarray(xs)
+    if coeffs is None:
+        coeffs = np.ones(2 * xs.shape[1])
+    strengths = np.prod(np.asarray(coeffs)**wall_count, axis=1)
+    mask = strengths != 0
+    if max_distance is not None:
+        outside = np.maximum(-xs, 0) + np.maximum(xs - asarray_1d(L), 0)
+        mask &= _kernels.norm1d(outside) <= max_distance
+    if threshold is not None:
+        mask &= np.abs(strengths) >= threshold
+    return xs[mask], strengths[mask]
+
+
 def spherical_hn2(n, z):
     r"""Spherical Hankel function of 2nd kind.
 
@@ -555,6 +977,106 @@ def spherical_hn2(n, z):
     return spherical_jn(n, z) - 1j * spherical_yn(n, z)
 
 
+def special_function_table(name, orders, z):
+    r"""Evaluate a (cylindrical or spherical) special function for many orders.
+
+    Repeated calls with the same orders and arguments return the
+    memoized result.  The memory used for this is bounded, the least
+    recently used tables are discarded.
+    Only tables for at most 4096 arguments (e.g. one per frequency or
+    per secondary source) are memoized, larger arguments (e.g. one per
+    grid point) are rarely re-used and are evaluated without looking
+    them up in the cache.
+
+    Parameters
+    ----------
+    name : {'jn', 'hankel2', 'spherical_hn2'}
+        Bessel function of the first kind, Hankel function of the second
+        kind or spherical Hankel function of the second kind (see
+        `spherical_hn2()`).
+    orders : (M,) array_like
+        Orders (not necessarily integer, except for ``'spherical_hn2'``).
+    z : array_like
+        Argument(s), broadcast against *orders* like in
+        :mod:`scipy.special`.  Typically, this is a scalar or an array
+        with a last axis of length 1.
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only array of function values, with the orders along the
+        last axis.
+
+    Notes
+    -----
+    If *orders* are :math:`0, 1, \dots, M` and the arguments are the
+    same for all orders, the (spherical) Hankel functions of all orders
+    are computed in one pass with the recurrence relations
+    https://dlmf.nist.gov/10.6.E1 and https://dlmf.nist.gov/10.51.E1,
+
+    .. math::
+
+        \Hankel{2}{n+1}{z} = \frac{2n}{z} \Hankel{2}{n}{z}
+        - \Hankel{2}{n-1}{z}, \qquad
+        \hankel{2}{n+1}{z} = \frac{2n+1}{z} \hankel{2}{n}{z}
+        - \hankel{2}{n-1}{z},
+
+    which are stable in forward direction for Hankel functions.
+    Note that in this case, for orders larger than the argument, the
+    (very small) real part, i.e. the Bessel function of the first kind,
+    is only accurate relative to the magnitude of the (very large)
+    imaginary part.  This is sufficient for the modal driving functions
+    in `sfs.fd.nfchoa`, which use the complex values, but not if the
+    real part is needed on its own; use `spherical_hn2()` or
+    :mod:`scipy.special` in that case.
+
+    """
+    orders = asarray_1d(orders)
+    z = np.asarray(z)
+
+    def evaluate():
+        table = _special_function(name, orders, z)
+        table.flags.writeable = False
+        return table,
+
+    if z.size > _special_function_tables_max_arguments:
+        return evaluate()[0]
+    # The (orders, z) pair is used in place of a grid:
+    return _special_function_tables.get(name, (orders, z), evaluate)[0]
+
+
+_special_function_tables = GeometryCache(max_bytes=2**27)
+_special_function_tables_max_arguments = 4096
+
+_special_functions = {
+    'jn': jv,
+    'hankel2': hankel2,
+    'spherical_hn2': lambda n, z: spherical_jn(n, z) - 1j * spherical_yn(n, z),
+}
+
+
+def _special_function(name, orders, z):
+    """Evaluate special function, use recurrence over orders if possible."""
+    function = _special_functions[name]
+    orders = np.asarray(orders)
+    z = np.asarray(z)
+    use_recurrence = (
+        name in ('hankel2', 'spherical_hn2') and
+        orders.ndim == 1 and len(orders) > 2 and
+        np.array_equal(orders, np.arange(len(orders))) and
+        (z.ndim == 0 or z.shape[-1] == 1))
+    if not use_recurrence:
+        return function(orders, z)
+    out = np.empty(np.broadcast(orders, z).shape, dtype=complex)
+    out[..., :2] = function(orders[:2], z)
+    if z.ndim:
+        z = z[..., 0]
+    offset = 0.5 if name == 'spherical_hn2' else 0
+    for n in range(1, len(orders) - 1):
+        out[..., n + 1] = 2 * (n + offset) / z * out[..., n] - out[..., n - 1]
+    return out
+
+
 def source_selection_plane(n0, n):
     """Secondary source selection for a plane wave.
 
@@ -576,7 +1098,7 @@ def source_selection_point(n0, x0, xs):
     x0 = asarray_of_rows(x0)
     xs = asarray_1d(xs)
     ds = x0 - xs
-    return inner1d(ds, n0) >= default.selection_tolerance
+    return _kernels.inner1d(ds, n0) >= default.selection_tolerance
 
 
 def source_selection_line(n0, x0, xs):
@@ -598,7 +1120,7 @@ def source_selection_focused(ns, x0, xs):
     xs = asarray_1d(xs)
     ns = normalize_vector(ns)
     ds = xs - x0
-    return inner1d(ns, ds) >= default.selection_tolerance
+    return _kernels.inner1d(ns, ds) >= default.selection_tolerance
 
 
 def source_selection_all(N):
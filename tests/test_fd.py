@@ -0,0 +1,374 @@
+import itertools
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+import sfs
+
+
+omega = 2 * np.pi * 500
+array = sfs.array.circular(32, 1.5)
+grid = sfs.util.xyz_grid([-2, 2], [-2, 2], 0, spacing=0.1)
+
+
+def _per_source(secondary_source_function):
+    """Hide the vectorized implementation of a secondary source."""
+    return lambda position, normal, **kwargs: secondary_source_function(
+        position, normal, **kwargs)
+
+
+@pytest.mark.parametrize('driving_function, args', [
+    (sfs.fd.wfs.point_25d, ([-1.5, 2, 0],)),
+    (sfs.fd.wfs.line_2d, ([-1.5, 2, 0],)),
+])
+@pytest.mark.parametrize('chunksize', [None, 1, 5])
+def test_synthesize_vectorized(driving_function, args, chunksize):
+    d, selection, secondary_source = driving_function(
+        omega, array.x, array.n, *args)
+    assert secondary_source.vectorized
+    p = sfs.fd.synthesize(d, selection, array, secondary_source,
+                          chunksize=chunksize, grid=grid)
+    expected = sfs.fd.synthesize(d, selection, array,
+                                 _per_source(secondary_source), grid=grid)
+    assert p.shape == expected.shape
+    assert_allclose(p, expected)
+
+
+grid_3d = sfs.util.xyz_grid([-1, 1], [-1, 1], [-0.5, 0.5], spacing=0.25)
+
+
+@pytest.mark.parametrize('source_function, args', [
+    (sfs.fd.source.point, ([1.5, 1, 0],)),
+    (sfs.fd.source.point_dipole, ([1.5, 1, 0], [0, 1, 0])),
+    (sfs.fd.source.line, ([1.5, 1, 0],)),
+    (sfs.fd.source.plane, ([0, 0, 0], [1, 1, 0])),
+])
+@pytest.mark.parametrize('chunk_points', [1, 7, 50, 10**6])
+@pytest.mark.parametrize('g', [grid, grid_3d], ids=['2D', '3D'])
+def test_source_chunk_points(source_function, args, chunk_points, g):
+    p = source_function(omega, *args, g, chunk_points=chunk_points)
+    expected = source_function(omega, *args, g)
+    assert p.shape == expected.shape
+    assert_allclose(p, expected)
+
+
+@pytest.mark.parametrize('source_function, args', [
+    (sfs.fd.source.point, ([1.5, 1, 0],)),
+    (sfs.fd.source.point_dipole, ([1.5, 1, 0], [0, 1, 0])),
+    (sfs.fd.source.line, ([1.5, 1, 0],)),
+    (sfs.fd.source.line_dipole, ([1.5, 1, 0], [0, 1, 0])),
+    (sfs.fd.source.plane, ([0, 0, 0], [1, 1, 0])),
+])
+def test_source_single_precision(source_function, args, monkeypatch):
+    expected = source_function(omega, *args, grid_3d)
+    p = source_function(omega, *args, grid_3d, dtype='float32')
+    assert p.dtype == np.complex64
+    assert_allclose(p, expected, rtol=1e-4)
+    monkeypatch.setattr(sfs.default, 'dtype', 'float32')
+    assert source_function(omega, *args, grid_3d).dtype == np.complex64
+
+
+@pytest.mark.parametrize('broadband, single, args', [
+    (sfs.fd.source.point_broadband, sfs.fd.source.point, ([1.5, 1, 0],)),
+    (sfs.fd.source.plane_broadband, sfs.fd.source.plane,
+     ([0, 0, 0], [1, 1, 0])),
+])
+@pytest.mark.parametrize('resync', [1, 7, 64])
+def test_source_broadband(broadband, single, args, resync):
+    frequencies = 2 * np.pi * np.linspace(50, 2000, 40)
+    expected = np.array([single(o, *args, grid_3d) for o in frequencies])
+    p = broadband(frequencies, *args, grid_3d, resync=resync)
+    assert p.shape == expected.shape
+    assert_allclose(p, expected, rtol=1e-10)
+    assert_allclose(broadband(frequencies, *args, grid_3d, chunk_points=7),
+                    p)
+    p = broadband(frequencies, *args, grid_3d, resync=resync,
+                  dtype='float32')
+    assert p.dtype == np.complex64
+    assert_allclose(p, expected, rtol=1e-4)
+    with pytest.raises(ValueError):
+        broadband(frequencies[[0, 1, 3]], *args, grid_3d)
+
+
+omegas = 2 * np.pi * np.array([100, 300, 1000])
+xs = [-1.5, 2, 0]
+npw = [0, -1, 0]
+edge = sfs.array.edge(16, 0.2)
+
+
+@pytest.mark.parametrize('driving_function, args, kwargs', [
+    (sfs.fd.wfs.line_2d, (array.x, array.n, xs), {}),
+    (sfs.fd.wfs.point_2d, (array.x, array.n, xs), {}),
+    (sfs.fd.wfs.point_25d, (array.x, array.n, xs), {'omalias': 1000}),
+    (sfs.fd.wfs.point_25d_legacy, (array.x, array.n, xs), {}),
+    (sfs.fd.wfs.plane_2d, (array.x, array.n, npw), {}),
+    (sfs.fd.wfs.plane_25d, (array.x, array.n, npw), {}),
+    (sfs.fd.wfs.focused_2d, (array.x, array.n, [0, 0.5, 0], npw), {}),
+    (sfs.fd.wfs.focused_25d, (array.x, array.n, [0, 0.5, 0], npw), {}),
+    (sfs.fd.wfs.plane_3d_delay, (array.x, array.n, npw), {}),
+    (sfs.fd.nfchoa.plane_2d, (array.x, 1.5, npw), {}),
+    (sfs.fd.nfchoa.point_25d, (array.x, 1.5, xs), {}),
+    (sfs.fd.nfchoa.plane_25d, (array.x, 1.5, npw), {}),
+    (sfs.fd.sdm.line_2d, (array.x, array.n, xs), {}),
+    (sfs.fd.sdm.plane_2d, (array.x, array.n, npw), {}),
+    (sfs.fd.sdm.plane_25d, (array.x, array.n, npw), {'xref': [0, 1, 0]}),
+    (sfs.fd.sdm.point_25d, (array.x, array.n, xs), {'xref': [0, 1, 0]}),
+    (sfs.fd.esa.plane_2d_edge, (edge.x, [1, 1, 0]), {'Nc': 10}),
+    (sfs.fd.esa.line_2d_edge, (edge.x, [1, 1, 0]), {'Nc': 10}),
+    (sfs.fd.esa.point_25d_edge, (edge.x, [1, 1, 0]), {'Nc': 10}),
+])
+def test_driving_function_multiple_frequencies(driving_function, args,
+                                               kwargs):
+    d, selection, secondary_sources = driving_function(
+        omegas, *args, **kwargs)
+    results = [driving_function(omega, *args, **kwargs) for omega in omegas]
+    assert d.shape == (len(omegas), len(args[0]))
+    assert_allclose(d, [result[0] for result in results])
+    assert len(secondary_sources) == len(omegas)
+    g = sfs.util.xyz_grid([-0.5, 0.5], [-0.5, 0.5], 0, spacing=0.5)
+    for secondary_source, result in zip(secondary_sources, results):
+        expected = result[2]
+        assert_allclose(secondary_source(args[0][0], None, grid=g),
+                        expected(args[0][0], None, grid=g))
+
+
+@pytest.mark.parametrize('driving_function, arg', [
+    (sfs.fd.nfchoa.plane_2d, npw),
+    (sfs.fd.nfchoa.point_25d, xs),
+    (sfs.fd.nfchoa.plane_25d, npw),
+])
+@pytest.mark.parametrize('max_order', [None, 40])
+@pytest.mark.parametrize('w', [omega, omegas])
+def test_nfchoa_equiangular(driving_function, arg, max_order, w):
+    # Shuffled secondary sources are not equiangular, this uses the
+    # matrix product instead of the FFT:
+    order = np.random.RandomState(4).permutation(len(array.x))
+    d = driving_function(w, array.x, 1.5, arg, max_order=max_order)[0]
+    d_shuffled = driving_function(w, array.x[order], 1.5, arg,
+                                  max_order=max_order)[0]
+    d_reversed = driving_function(w, array.x[::-1], 1.5, arg,
+                                  max_order=max_order)[0]
+    assert_allclose(d_shuffled, d[..., order])
+    assert_allclose(d_reversed, d[..., ::-1])
+
+
+def test_nfchoa_plane_2d_modal_sum():
+    from scipy.special import hankel2
+    max_order = 20
+    d = sfs.fd.nfchoa.plane_2d(omega, array.x, 1.5, npw,
+                               max_order=max_order)[0]
+    k = omega / sfs.default.c
+    phi0 = np.arctan2(array.x[:, 1], array.x[:, 0])
+    phi = np.arctan2(npw[1], npw[0])
+    expected = sum(1j**-m / hankel2(m, k * 1.5) * np.exp(1j * m * (phi0 - phi))
+                   for m in range(-max_order, max_order + 1))
+    assert_allclose(d, -2j / (np.pi * 1.5) * expected)
+
+
+def test_line_dirichlet_edge():
+    x0 = [1, 1, 0]
+    p = sfs.fd.source.line_dirichlet_edge(omega, x0, grid, Nc=40)
+    assert p.shape == (41, 41)
+    # outside of the edge (between 270 and 360 degrees) it's a line source
+    outside = (grid[0] > 0) & (grid[1] < 0)
+    with np.errstate(invalid='ignore'):
+        expected = sfs.fd.source.line(omega, x0, grid)
+    assert_allclose(p[outside], expected[outside])
+
+
+def _point_modal_loop(omega, x0, grid, L, orders, deltan):
+    k = omega / sfs.default.c
+    p = 0
+    for m, n, l in itertools.product(*orders):
+        km = [o * np.pi / length for o, length in zip((m, n, l), L)]
+        p = p + 8 / (k**2 - sum((kx + 1j * deltan)**2 for kx in km)) * (
+            np.cos(km[0] * grid[0]) * np.cos(km[0] * x0[0]) *
+            np.cos(km[1] * grid[1]) * np.cos(km[1] * x0[1]) *
+            np.cos(km[2] * grid[2]) * np.cos(km[2] * x0[2]))
+    return p
+
+
+@pytest.mark.parametrize('g', [
+    sfs.util.xyz_grid([0, 3], [0, 4], 1, spacing=0.25),
+    sfs.util.xyz_grid([0, 3], [0, 4], [0, 2.5], spacing=0.5),
+    sfs.util.as_xyz_components(([0.5, 1, 2], [1, 2, 3], [0.1, 0.2, 0.3])),
+])
+def test_point_modal(g):
+    L = 3, 4, 2.5
+    x0 = 1, 1.2, 0.5
+    N = [2, [0, 2, 5], 3]
+    orders = [range(3), [0, 2, 5], range(4)]
+    p = sfs.fd.source.point_modal(omega, x0, g, L, N=N, deltan=0.1)
+    assert_allclose(p, _point_modal_loop(omega, x0, g, L, orders, 0.1))
+    basis = sfs.fd.source.modal_basis(g, L, N)
+    for w in omega, 2 * omega:
+        assert_allclose(
+            sfs.fd.source.point_modal(w, x0, None, None, deltan=0.1,
+                                      basis=basis),
+            sfs.fd.source.point_modal(w, x0, g, L, N=N, deltan=0.1))
+
+
+def test_point_image_sources():
+    room = 5, 3, 1.5
+    x0 = 1, 1, 0.5
+    coeffs = .8, .8, .6, .6, .7, .7
+    g = sfs.util.xyz_grid([0, 5], [0, 3], 0.7, spacing=0.25)
+    xs, wall_count = sfs.util.image_sources_for_box(x0, room, 3)
+    strengths = np.prod(np.array(coeffs)**wall_count, axis=1)
+    expected = sum(strength * sfs.fd.source.point(omega, x, g)
+                   for x, strength in zip(xs, strengths))
+    p = sfs.fd.source.point_image_sources(omega, x0, g, room, max_order=3,
+                                          coeffs=coeffs)
+    assert_allclose(p, expected)
+    threshold = 0.3
+    p = sfs.fd.source.point_image_sources(omega, x0, g, room, max_order=3,
+                                          coeffs=coeffs, threshold=threshold)
+    expected = sum(strength * sfs.fd.source.point(omega, x, g)
+                   for x, strength in zip(xs, strengths)
+                   if strength >= threshold)
+    assert_allclose(p, expected)
+
+
+def test_synthesize_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(sfs.default, 'chunk_size', 100)  # several tiles
+    d, selection, secondary_source = sfs.fd.wfs.point_25d(
+        omega, array.x, array.n, xs)
+    expected = sfs.fd.synthesize(d, selection, array, secondary_source,
+                                 grid=grid_3d)
+    out = np.lib.format.open_memmap(tmp_path / 'p.npy', mode='w+',
+                                    dtype=complex, shape=expected.shape)
+    p = sfs.fd.synthesize(d, selection, array, secondary_source,
+                          grid=grid_3d, out=out)
+    assert p is out
+    assert_allclose(np.load(tmp_path / 'p.npy'), expected)
+
+
+# No grid points at the secondary sources
+inner_grid = sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.1)
+
+
+def test_synthesize_single_precision():
+    d, selection, secondary_source = sfs.fd.wfs.point_25d(
+        omega, array.x, array.n, xs)
+    expected = sfs.fd.synthesize(d, selection, array, secondary_source,
+                                 grid=inner_grid)
+    p = sfs.fd.synthesize(d, selection, array, secondary_source,
+                          grid=inner_grid, dtype='float32')
+    assert p.dtype == np.complex64
+    assert_allclose(p, expected, rtol=1e-4, atol=1e-4 * abs(expected).max())
+
+
+@pytest.mark.parametrize('chunk_size', [10**6, 100])
+def test_soundfigure_3d(chunk_size, monkeypatch):
+    monkeypatch.setattr(sfs.default, 'chunk_size', chunk_size)
+    cube = sfs.array.cube(N=4, spacing=0.3)
+    figure = np.zeros((12, 8))  # not square
+    figure[3:6, 2:6] = 1
+    k = omega / sfs.default.c
+    d, selection, _ = sfs.fd.wfs.soundfigure_3d(omega, cube.x, cube.n,
+                                                figure)
+    assert selection.all()
+    spectrum = np.fft.fft2(np.fft.fftshift(figure))
+    expected = 0
+    for n, kx in enumerate(np.fft.fftfreq(12, 1 / 12)):
+        for m, ky in enumerate(np.fft.fftfreq(8, 1 / 8)):
+            if kx**2 + ky**2 < k**2:
+                npw = [kx, ky, np.sqrt(k**2 - kx**2 - ky**2)]
+                d_plane, selection, _ = sfs.fd.wfs.plane_3d(
+                    omega, cube.x, cube.n, npw)
+                expected += selection * spectrum[n, m] * d_plane
+    assert_allclose(d, expected)
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+def test_synthesis_basis(vectorized):
+    d, selection, secondary_source = sfs.fd.wfs.point_25d(
+        omega, array.x, array.n, xs)
+    if not vectorized:
+        secondary_source = _per_source(secondary_source)
+    basis = sfs.fd.SynthesisBasis(array, secondary_source, grid=grid_3d,
+                                  chunksize=5)
+    for alpha in 0, 0.5:
+        weights = sfs.tapering.tukey(selection, alpha=alpha)
+        expected = sfs.fd.synthesize(d, weights, array, secondary_source,
+                                     grid=grid_3d)
+        assert basis.shape == expected.shape
+        assert_allclose(basis.synthesize(d, weights), expected)
+    p = basis.synthesize([d, 2 * d], selection)
+    assert p.shape == (2,) + expected.shape
+    assert_allclose(p[1], 2 * p[0])
+
+
+def test_synthesis_basis_inactive_source_on_grid():
+    # Grid points at the positions of (inactive) secondary sources:
+    small_array = sfs.array.circular(4, 1.5)
+    g = sfs.util.xyz_grid([-2, 2], [-2, 2], 0, spacing=0.5)
+    d, selection, secondary_source = sfs.fd.wfs.point_25d(
+        omega, small_array.x, small_array.n, [0, 3, 0])
+    basis = sfs.fd.SynthesisBasis(small_array, secondary_source, grid=g)
+    expected = sfs.fd.synthesize(d, selection, small_array, secondary_source,
+                                 grid=g)
+    p = basis.synthesize(d, selection)
+    assert_allclose(p, expected)
+    assert np.all(np.isfinite(p[np.isfinite(expected)]))
+    assert_allclose(basis.synthesize([d, 2 * d], selection)[1], 2 * expected)
+
+
+def test_synthesis_basis_single_precision():
+    d, selection, secondary_source = sfs.fd.wfs.point_25d(
+        omega, array.x, array.n, xs)
+    basis = sfs.fd.SynthesisBasis(array, secondary_source, grid=inner_grid,
+                                  dtype='float32')
+    assert basis.fields.dtype == np.complex64
+    expected = sfs.fd.synthesize(d, selection, array, secondary_source,
+                                 grid=inner_grid)
+    assert_allclose(basis.synthesize(d, selection), expected, rtol=1e-4,
+                    atol=1e-4 * abs(expected).max())
+
+
+@pytest.mark.parametrize('tolerance', [1e-2, 1e-8])
+def test_low_rank_transfer(tolerance):
+    d, selection, secondary_source = sfs.fd.wfs.point_25d(
+        omega, array.x, array.n, xs)
+    G = sfs.fd.transfer.LowRankTransfer(
+        array, secondary_source, inner_grid, tolerance=tolerance,
+        chunk_points=100, seed=0)
+    assert G.rank <= len(array.x)
+    fields = np.stack([sfs.fd.source.point(omega, x, inner_grid)
+                       for x in array.x])
+    dense = fields.reshape(len(array.x), -1).T * array.a
+    approximation = G.U * G.s @ G.Vh
+    assert (np.linalg.norm(approximation - dense) <=
+            tolerance * np.linalg.norm(dense))
+    expected = sfs.fd.synthesize(d, selection, array, secondary_source,
+                                 grid=inner_grid)
+    p = G.apply(d * selection)
+    assert p.shape == expected.shape
+    assert_allclose(p, expected, atol=tolerance * abs(expected).max())
+    assert G.apply([d, d]).shape == (2,) + expected.shape
+    field = np.exp(1j * np.arange(p.size)).reshape(p.shape)
+    assert_allclose(G.adjoint(field), approximation.conj().T @ field.ravel())
+
+
+@pytest.mark.parametrize('secondary_source_function', [
+    sfs.fd.secondary_source_point(omega, None),
+    sfs.fd.secondary_source_line(omega, None),
+])
+def test_hierarchical_transfer(secondary_source_function):
+    ssd = sfs.array.circular(128, 1.5)
+    g = sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.05)
+    G = sfs.fd.transfer.HierarchicalTransfer(
+        ssd, secondary_source_function, g, tolerance=1e-6, leaf_size=16)
+    assert G.compression < 1
+    fields = secondary_source_function(ssd.x, ssd.n, grid=g)
+    dense = fields.reshape(len(ssd.x), -1).T * ssd.a
+    d = np.exp(2j * np.arange(len(ssd.x)))
+    p = G.apply([d, 2 * d])
+    assert p.shape == (2,) + G.shape
+    expected = dense @ d
+    assert_allclose(p[0].ravel(), expected, atol=1e-5 * abs(expected).max())
+    assert_allclose(p[1], 2 * p[0])
+    field = np.exp(1j * np.arange(p[0].size)).reshape(G.shape)
+    expected = dense.conj().T @ field.ravel()
+    assert_allclose(G.adjoint(field), expected,
+                    atol=1e-5 * abs(expected).max())
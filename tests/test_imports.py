@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _imported_modules(code, modules):
+    """Run *code* in a new interpreter, return which *modules* it loaded."""
+    check = 'import sys; print(*[m for m in {!r} if m in sys.modules])'
+    result = subprocess.run(
+        [sys.executable, '-c', code + '\n' + check.format(modules)],
+        stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize('code', [
+    'import sfs',
+    'import sfs.array',
+    'import sfs.fd.wfs',
+    'import sfs; sfs.array.circular(16, 1); sfs.fd.wfs.point_25d',
+])
+def test_lazy_imports(code):
+    heavy = ['matplotlib', 'scipy.signal', 'sfs.plot2d', 'sfs.td']
+    assert _imported_modules(code, heavy) == []
+
+
+def test_lazy_imports_on_first_use():
+    code = 'import sfs; sfs.td.nfchoa'
+    assert _imported_modules(code, ['scipy.signal']) == ['scipy.signal']
@@ -0,0 +1,298 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+from scipy.signal import sosfilt, unit_impulse
+from scipy.special import eval_legendre
+import sfs
+
+
+fs = 44100
+signal = unit_impulse(512), fs
+array = sfs.array.circular(32, 1.5)
+grid = sfs.util.xyz_grid([-2, 2], [-2, 2], 0, spacing=0.1)
+xs = [-1.5, 2, 0]
+t = np.linalg.norm(xs) / sfs.default.c
+
+
+def _wfs_point_25d():
+    delays, weights, selection, secondary_source = sfs.td.wfs.point_25d(
+        array.x, array.n, xs)
+    d = sfs.td.wfs.driving_signals(delays, weights, signal)
+    return d, selection, secondary_source
+
+
+@pytest.mark.parametrize('workers', [1, 3, ThreadPoolExecutor(2)])
+def test_synthesize_workers(workers):
+    d, selection, secondary_source = _wfs_point_25d()
+    p = sfs.td.synthesize(d, selection, array, secondary_source, grid=grid,
+                          observation_time=t, workers=workers)
+    expected = sfs.td.synthesize(d, selection, array, secondary_source,
+                                 grid=grid, observation_time=t)
+    assert_allclose(p, expected)
+
+
+def test_synthesize_geometry_cache():
+    d, selection, secondary_source = _wfs_point_25d()
+    cache = sfs.util.GeometryCache()
+    for time in t, t + 0.001:
+        p = sfs.td.synthesize(d, selection, array, secondary_source,
+                              grid=grid, observation_time=time, cache=cache,
+                              workers=2)
+        expected = sfs.td.synthesize(d, selection, array, secondary_source,
+                                     grid=grid, observation_time=time)
+        assert_allclose(p, expected)
+    assert len(cache) == np.count_nonzero(selection)
+
+
+def test_synthesize_geometry_cache_hashes_grid_once(monkeypatch):
+    d, selection, secondary_source = _wfs_point_25d()
+    cache = sfs.util.GeometryCache()
+    calls = []
+    grid_key = sfs.util.GeometryCache.grid_key
+
+    def counting_grid_key(grid):
+        calls.append(grid)
+        return grid_key(grid)
+
+    monkeypatch.setattr(sfs.util.GeometryCache, 'grid_key',
+                        staticmethod(counting_grid_key))
+    sfs.td.synthesize(d, selection, array, secondary_source, grid=grid,
+                      observation_time=t, cache=cache)
+    assert len(calls) == 1
+    assert len(cache) == np.count_nonzero(selection)
+
+
+def test_geometry_cache_eviction():
+    entry_size = 2 * np.broadcast(*grid).size * 8
+    cache = sfs.util.GeometryCache(max_bytes=3 * entry_size)
+    for x in array.x:
+        sfs.td.source.point(x, signal, t, grid, cache=cache)
+    assert len(cache) == 3
+    assert cache.nbytes == 3 * entry_size
+
+
+def test_geometry_cache_grid_changed_in_place():
+    g = sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.25)
+    xs = array.x[0]
+    cache = sfs.util.GeometryCache()
+    first = sfs.td.source.point(xs, signal, t, g, cache=cache)
+    g[0][...] += 0.3
+    p = sfs.td.source.point(xs, signal, t, g, cache=cache)
+    assert_allclose(p, sfs.td.source.point(xs, signal, t, g))
+    assert not np.allclose(p, first)
+    assert len(cache) == 2
+
+
+def test_synthesize_multiple_observation_times():
+    d, selection, secondary_source = _wfs_point_25d()
+    times = t + np.arange(5) / 1000
+    p = sfs.td.synthesize(d, selection, array, secondary_source, grid=grid,
+                          observation_time=times)
+    expected = [sfs.td.synthesize(d, selection, array, secondary_source,
+                                  grid=grid, observation_time=time)
+                for time in times]
+    assert p.shape == (len(times),) + np.broadcast(*grid).shape
+    assert_allclose(p, expected)
+
+
+@pytest.mark.parametrize('driving_function, driving_signals, xs', [
+    (sfs.td.nfchoa.plane_25d, sfs.td.nfchoa.driving_signals_25d, [0, -1, 0]),
+    (sfs.td.nfchoa.point_25d, sfs.td.nfchoa.driving_signals_25d, [0, 2, 0]),
+    (sfs.td.nfchoa.plane_3d, sfs.td.nfchoa.driving_signals_3d, [0, -1, 0]),
+    (sfs.td.nfchoa.point_3d, sfs.td.nfchoa.driving_signals_3d, [0, 2, 0]),
+])
+def test_nfchoa_driving_signals(driving_function, driving_signals, xs):
+    data = np.random.RandomState(0).randn(100)
+    delay, weight, sos, phaseshift, _, _ = driving_function(
+        array.x, 1.5, xs, fs)
+    d = driving_signals(delay, weight, sos, phaseshift, (data, fs))
+    # Straightforward implementation, one mode after the other:
+    expected = 0
+    for m, sos_m in enumerate(sos):
+        if driving_signals is sfs.td.nfchoa.driving_signals_25d:
+            mode_weight = 2 * weight * np.cos(m * phaseshift)
+        else:
+            mode_weight = (weight / 4 / np.pi * (2 * m + 1) *
+                           eval_legendre(m, np.cos(phaseshift)))
+        expected += np.outer(sosfilt(sos_m, data),
+                             mode_weight)
+    assert d.data.shape == (len(data), len(array.x))
+    assert_allclose(d.data, expected)
+    assert d.time == delay
+
+
+@pytest.mark.parametrize('driving_function, driving_signals, processor', [
+    (sfs.td.nfchoa.point_25d, sfs.td.nfchoa.driving_signals_25d,
+     sfs.td.nfchoa.BlockProcessor25d),
+    (sfs.td.nfchoa.point_3d, sfs.td.nfchoa.driving_signals_3d,
+     sfs.td.nfchoa.BlockProcessor3d),
+])
+def test_nfchoa_block_processor(driving_function, driving_signals,
+                                processor):
+    data = np.random.RandomState(0).randn(1000)
+    delay, weight, sos, phaseshift, _, _ = driving_function(
+        array.x, 1.5, [0, 2, 0], fs)
+    expected = driving_signals(delay, weight, sos, phaseshift, (data, fs))
+    blocksize = 256
+    p = processor(delay, weight, sos, phaseshift, blocksize)
+    d = np.concatenate([p.process(data[i:i + blocksize]).copy()
+                        for i in range(0, len(data), blocksize)])
+    assert_allclose(d, expected.data)
+    assert p.delay == expected.time
+
+
+def test_wfs_block_renderer():
+    delays = np.array([-1, 0, 2, 7.5]) / fs
+    weights = np.array([1, 0.5, 2, 1])
+    data = np.random.RandomState(1).randn(1024)
+    blocksize = 128
+    renderer = sfs.td.wfs.BlockRenderer(delays, weights, fs, blocksize)
+    d = np.concatenate([renderer.process(data[i:i + blocksize]).copy()
+                        for i in range(0, len(data), blocksize)])
+    # integer delays are exact, a fractional delay is not:
+    expected = sfs.td.wfs.driving_signals(
+        delays + renderer.pre_delay, weights, (data, fs))
+    start = int(round(expected.time * fs))
+    assert start == 1
+    assert_allclose(d[start:, :3], expected.data[:len(data) - start, :3],
+                    atol=1e-12)
+
+
+def test_wfs_block_renderer_moving():
+    delays1 = np.array([0, 3.2, 10.5]) / fs
+    delays2 = np.array([1, 2.7, 12.25]) / fs
+    weights = np.ones(3)
+    data = np.random.RandomState(2).randn(1024)
+    blocksize = 64
+    options = dict(pre_delay=2 / fs, max_delay=20 / fs)
+    moving = sfs.td.wfs.BlockRenderer(delays1, weights, fs, blocksize,
+                                      **options)
+    static = sfs.td.wfs.BlockRenderer(delays2, weights, fs, blocksize,
+                                      **options)
+    for i in range(0, len(data), blocksize):
+        if i == 4 * blocksize:
+            moving.set_delays(delays2, weights)
+        block = data[i:i + blocksize]
+        d_moving, d_static = moving.process(block), static.process(block)
+        if i > 4 * blocksize:
+            assert_allclose(d_moving, d_static)
+    with pytest.raises(ValueError):
+        moving.set_delays([0, 0, 30 / fs])
+
+
+def test_apply_delays():
+    data = np.random.RandomState(3).randn(100)
+    delays = np.array([0.1, -2, 3.4, 0]) / fs
+    d = sfs.td.apply_delays((data, fs, 1 / fs), delays)
+    delays_samples = np.rint(fs * (delays + 1 / fs)).astype(int)
+    assert d.time == delays_samples.min() / fs
+    delays_samples -= delays_samples.min()
+    expected = np.zeros((delays_samples.max() + len(data), len(delays)))
+    for column, row in enumerate(delays_samples):
+        expected[row:row + len(data), column] = data
+    assert_allclose(d.data, expected)
+    sparse = sfs.td.apply_delays((data, fs, 1 / fs), delays, sparse=True)
+    assert np.shares_memory(sparse.data, data)
+    assert_allclose(sparse.time, delays + 1 / fs)
+    assert_allclose(sparse.todense().data, d.data)
+    weights = np.array([0.5, -1, 2, 0])
+    weighted = sparse._replace(weights=weights).todense()
+    assert_allclose(weighted.data, d.data * weights)
+    assert weighted.time == d.time
+
+
+def test_synthesize_sparse():
+    delays, weights, selection, secondary_source = sfs.td.wfs.point_25d(
+        array.x, array.n, xs)
+    # same result with and without sparse for whole-sample delays:
+    delays = np.rint(delays * fs) / fs
+    d = sfs.td.wfs.driving_signals(delays, weights, (unit_impulse(512, 1), fs),
+                                   sparse=True)
+    p = sfs.td.synthesize(d, selection, array, secondary_source, grid=grid,
+                          observation_time=t)
+    expected = sfs.td.synthesize(d.todense(), selection, array,
+                                 secondary_source, grid=grid,
+                                 observation_time=t)
+    assert_allclose(p, expected, atol=1e-10)
+
+
+@pytest.mark.parametrize('observation_time', [0.01, [0.005, 0.01]])
+def test_point_image_sources(observation_time):
+    room = 5, 3, 1.5
+    x0 = 1, 1, 0.5
+    coeffs = .8, .8, .6, .6, .7, .7
+    g = sfs.util.xyz_grid([0, 5], [0, 3], 0.7, spacing=0.25)
+    xs, wall_count = sfs.util.image_sources_for_box(x0, room, 3)
+    strengths = np.prod(np.array(coeffs)**wall_count, axis=1)
+    expected = sum(
+        strength * sfs.td.source.point(x, signal, observation_time, g)
+        for x, strength in zip(xs, strengths))
+    p = sfs.td.source.point_image_sources(x0, signal, observation_time, g,
+                                          room, 3, coeffs)
+    assert_allclose(p, expected)
+
+
+def test_room_impulse_responses():
+    room = 5, 3, 1.5
+    x0 = 1, 1, 0.5
+    coeffs = .8, .8, .6, .6, .7, .7
+    receivers = [[2, 1.5, 0.7], [4, 0.5, 1]]
+    h = sfs.td.source.room_impulse_responses(x0, receivers, room, 2, fs,
+                                             coeffs=coeffs, order=1)
+    assert h.samplerate == fs
+    assert h.time == 0
+    # with linear interpolation, this is the same as the sound field of
+    # an impulse, evaluated at the receiver positions:
+    t = np.arange(len(h.data)) / fs
+    g = sfs.util.as_xyz_components(np.transpose(receivers))
+    impulse = unit_impulse(len(t), 1), fs, -1 / fs  # leading zero
+    expected = sfs.td.source.point_image_sources(x0, impulse, t, g, room, 2,
+                                                 coeffs)
+    assert_allclose(h.data, expected, rtol=1e-10, atol=1e-12)
+    several = sfs.td.source.room_impulse_responses(
+        [x0, [3, 2, 1]], receivers, room, 2, fs, coeffs=coeffs, order=1,
+        length=len(t))
+    assert several.data.shape == (len(t), 2, 2)
+    assert_allclose(several.data[:, 0], h.data)
+
+
+def test_synthesize_out(monkeypatch):
+    monkeypatch.setattr(sfs.default, 'chunk_size', 100)  # several tiles
+    d, selection, secondary_source = _wfs_point_25d()
+    times = [t, t + 0.001]
+    expected = sfs.td.synthesize(d, selection, array, secondary_source,
+                                 grid=grid, observation_time=times)
+    out = np.zeros_like(expected)
+    p = sfs.td.synthesize(d, selection, array, secondary_source, grid=grid,
+                          observation_time=times, out=out)
+    assert p is out
+    assert_allclose(out, expected)
+
+
+# No grid point at the source position
+inner_grid = sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.1)
+
+
+def test_point_single_precision():
+    time = t + 0.25 / fs  # not exactly at the start of the impulse
+    expected = sfs.td.source.point(xs, signal, time, inner_grid)
+    p = sfs.td.source.point(xs, signal, time, inner_grid, dtype='float32')
+    assert p.dtype == np.float32
+    assert np.any(p)
+    assert_allclose(p, expected, rtol=1e-4, atol=1e-4 * abs(expected).max())
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_synthesize_single_precision(monkeypatch, workers):
+    d, selection, secondary_source = _wfs_point_25d()
+    expected = sfs.td.synthesize(d, selection, array, secondary_source,
+                                 grid=inner_grid, observation_time=t)
+    assert expected.dtype == np.float64
+    monkeypatch.setattr(sfs.default, 'dtype', 'float32')
+    p = sfs.td.synthesize(d, selection, array, secondary_source,
+                          grid=inner_grid, observation_time=t,
+                          workers=workers)
+    assert p.dtype == np.float32
+    assert_allclose(p, expected, rtol=1e-4, atol=1e-4 * abs(expected).max())
@@ -1,7 +1,9 @@
 import numpy as np
 from numpy.testing import assert_allclose
 import pytest
+import scipy.special
 import sfs
+from sfs import _kernels
 
 
 cart_sph_data = [
@@ -68,3 +70,120 @@ def test_db_amplitude(linear, power_db):
 def test_db_power(linear, power_db):
     d = sfs.util.db(linear, power=True)
     assert_allclose(d, power_db)
+
+
+@pytest.mark.parametrize('grid', [
+    sfs.util.xyz_grid([-1, 1], [-1, 1], 0, spacing=0.5),
+    sfs.util.xyz_grid([-1, 1], [-1, 1], [-1, 1], spacing=0.5),
+    sfs.util.as_xyz_components(np.random.RandomState(0).rand(3, 11)),
+])
+@pytest.mark.parametrize('chunk_points', [1, 3, 10, 1000])
+def test_evaluate_in_chunks(grid, chunk_points):
+    def func(grid):
+        x, y, z = grid
+        return x + 10 * y + 100 * z
+    covered = np.zeros(np.broadcast(*grid).shape, dtype=int)
+    for index, chunk in sfs.util.grid_chunks(grid, chunk_points):
+        assert np.broadcast(*chunk).size <= chunk_points
+        covered[index] += 1
+    assert np.all(covered == 1)
+    p = sfs.util.evaluate_in_chunks(func, grid, chunk_points)
+    assert_allclose(p, func(grid))
+
+
+@pytest.mark.parametrize('coordinate, axis', [('x', 1), ('y', 0), ('z', 2)])
+def test_slice_field(coordinate, axis):
+    grid = sfs.util.xyz_grid([-1, 1], [-2, 2], [0, 1], spacing=0.5)
+    x, y, z = grid
+    p = np.asarray(x + 10 * y + 100 * z)
+    ps, gs = sfs.util.slice_field(p, grid, **{coordinate: 0.6})
+    assert ps.shape[axis] == 1
+    assert ps.shape == np.broadcast(*gs).shape
+    assert_allclose(gs['xyz'.index(coordinate)], 0.5)
+    x, y, z = gs
+    assert_allclose(ps, x + 10 * y + 100 * z)
+    assert_allclose(sfs.util.normalize(ps, gs, [0.6, 0.6, 0.6]),
+                    ps / abs(0.5 + 10 * 0.5 + 100 * 0.5))
+    assert sfs.util.slice_field(p, grid)[0] is p
+    with pytest.raises(ValueError):
+        sfs.util.slice_field(p, grid, x=0, y=0)
+
+
+@pytest.mark.parametrize('order', [1, 2, 3, 4])
+def test_lagrange_fractional_delay(order):
+    delay = np.array([2.3, 4.0, 5.75])
+    offset, h = sfs.util.lagrange_fractional_delay(delay, order)
+    x = np.arange(20.0)**order  # polynomials are interpolated exactly
+    n = 10
+    y = [np.sum(h_c * x[n - o_c - np.arange(order + 1)])
+         for o_c, h_c in zip(offset, h)]
+    assert_allclose(y, (n - delay)**order)
+
+
+@pytest.mark.parametrize('name, function', [
+    ('jn', lambda n, z: scipy.special.jv(n, z)),
+    ('hankel2', lambda n, z: scipy.special.hankel2(n, z)),
+    ('spherical_hn2', lambda n, z: (scipy.special.spherical_jn(n, z) -
+                                    1j * scipy.special.spherical_yn(n, z))),
+])
+@pytest.mark.parametrize('orders', [np.arange(30), np.arange(5) * 1.5])
+@pytest.mark.parametrize('z', [2.5, [[0.5], [3], [40]], [[1, 2, 3, 4, 5]]])
+def test_special_function_table(name, function, orders, z):
+    if name == 'spherical_hn2' and orders.dtype != int:
+        pytest.skip('spherical Hankel functions need integer orders')
+    if np.shape(z)[-1:] == (5,) and len(orders) != 5:
+        pytest.skip('shape mismatch')
+    table = sfs.util.special_function_table(name, orders, z)
+    assert_allclose(table, function(orders, z), rtol=1e-12)
+    assert sfs.util.special_function_table(name, orders, z) is table
+    assert not table.flags.writeable
+
+
+def test_special_function_table_large_argument():
+    z = np.linspace(0.1, 10, 5000)[:, np.newaxis]
+    orders = np.arange(4)
+    table = sfs.util.special_function_table('jn', orders, z)
+    assert_allclose(table, scipy.special.jv(orders, z))
+    # Arguments of this size are not memoized:
+    assert sfs.util.special_function_table('jn', orders, z) is not table
+
+
+def test_spherical_hn2_small_argument():
+    n = np.arange(20)
+    hn2 = sfs.util.spherical_hn2(n, 0.1)
+    assert_allclose(hn2.real, scipy.special.spherical_jn(n, 0.1), rtol=1e-12)
+    assert_allclose(hn2.imag, -scipy.special.spherical_yn(n, 0.1), rtol=1e-12)
+
+
+def test_select_image_sources():
+    xs = [[1, 1], [-1, 1], [-4, 1], [2, 7]]
+    wall_count = [[0, 0, 0, 0], [1, 0, 0, 0], [1, 1, 0, 0], [0, 0, 1, 1]]
+    L = 2, 3
+    coeffs = 0.5, 0.8, 0, 1
+    selected, strengths = sfs.util.select_image_sources(
+        xs, wall_count, L, coeffs=coeffs)
+    assert_allclose(selected, [[1, 1], [-1, 1], [-4, 1]])
+    assert_allclose(strengths, [1, 0.5, 0.4])
+    selected, strengths = sfs.util.select_image_sources(
+        xs, wall_count, L, max_distance=2, threshold=0.9)
+    assert_allclose(selected, [[1, 1], [-1, 1]])
+    assert_allclose(strengths, [1, 1])
+
+
+@pytest.mark.parametrize('a, b', [
+    (np.arange(12.).reshape(4, 3), np.arange(12.)[::-1].reshape(4, 3)),
+    (np.arange(12.).reshape(4, 3), [1, -2, 0.5]),
+    ([1, -2, 0.5], np.arange(24.).reshape(2, 4, 3)),
+    (np.arange(12.).reshape(4, 3), np.arange(24.).reshape(2, 4, 3)),
+    # More rows than the block size of the 2D fast path:
+    (np.random.RandomState(1).randn(5000, 3),
+     np.random.RandomState(2).randn(5000, 3)),
+])
+def test_kernels(a, b):
+    expected = np.sum(np.multiply(a, b), axis=-1)
+    assert_allclose(_kernels.inner1d(a, b), expected)
+    out = np.empty(np.shape(expected))
+    assert _kernels.inner1d(a, b, out=out) is out
+    assert_allclose(out, expected)
+    assert_allclose(_kernels.norm1d(b), np.linalg.norm(b, axis=-1))
+    assert_allclose(np.linalg.norm(_kernels.normalize1d(a), axis=-1), 1)